@@ -1,9 +1,4 @@
-import pygame
-import sys
-from pygame.locals import *
+from minichess.gui import run
 
-pygame.init()
-from game import MiniChess5x6
 if __name__ == "__main__":
-    game = MiniChess5x6()
-    game.run()
\ No newline at end of file
+    run()
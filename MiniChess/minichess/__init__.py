@@ -0,0 +1,6 @@
+"""ChessChamp: 5x6 MiniChess.
+
+minichess.engine holds the board, move generation and AI and never
+imports pygame; minichess.gui is the pygame front end, loaded only by
+minichess.gui.run().
+"""
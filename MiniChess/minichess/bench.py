@@ -0,0 +1,146 @@
+"""Search benchmark over a fixed set of 5x6 positions.
+
+    python -m minichess.bench                       # fixed depth (default 4)
+    python -m minichess.bench --depth 5
+    python -m minichess.bench --time 0.5            # fixed time budget per position
+    python -m minichess.bench --json results.json   # machine-readable output
+    python -m minichess.bench --engine "lmr_reduction=0 null_move_reduction=0"
+
+Each position gets a fresh engine, so runs are comparable between
+commits. Reported per position: nodes, nodes per second, time to each
+completed depth, effective branching factor, transposition table
+statistics (probes, hits, collisions, stores, overwrites) and best move.
+"""
+import argparse
+import json
+import sys
+import time
+from .engine.board import ChessBoard, move_to_text
+from .engine.ai import MiniChessAI
+from .selfplay import parse_engine_options
+
+BENCH_POSITIONS = [
+    ('opening', 'rnbqk/ppppp/5/5/PPPPP/RNBQK w'),
+    ('middlegame-1', 'r1bqk/p2pp/npp2/2NP1/PP2P/R1BQK w'),
+    ('middlegame-2', 'rn1qk/1ppbp/1p1p1/5/PBPPP/RN1QK w'),
+    ('middlegame-3', 'rnq1k/pbpp1/1p2p/1P2P/PBPP1/RNQ1K w'),
+    ('middlegame-4', 'rnb1k/1p1pp/1q3/1P2P/p1PPQ/RNB1K w'),
+    ('middlegame-5', 'r1b1k/ppn1q/2p2/N1p2/PP1QP/R1B1K w'),
+    ('endgame-1', 'k4/p1r2/5/2N2/1P3/4K w'),
+    ('endgame-2', '4k/1p3/5/1P1R1/5/K3q w'),
+    ('endgame-3', '2k2/5/1p3/1P3/3K1/4R b'),
+    ('endgame-4', 'k4/5/2n2/5/2P2/2K2 w'),
+    ('endgame-5', '3qk/5/5/5/PP3/K1Q2 w'),
+]
+
+
+def bench_position(fen, depth=None, time_limit=None, engine_options=None):
+    """Search one position; returns a dict of measurements.
+
+    engine_options maps MiniChessAI attribute names to values to override.
+    """
+    board = ChessBoard.from_fen(fen)
+    ai = MiniChessAI(depth=depth if depth is not None else 64)
+    ai.time_limit = time_limit
+    for name, value in (engine_options or {}).items():
+        setattr(ai, name, value)
+    iterations = []
+    ai.info_callback = iterations.append
+
+    start = time.perf_counter()
+    move = ai.get_best_move(board, board.current_turn)
+    elapsed = time.perf_counter() - start
+
+    tt_stats = ai.tt.stats()
+    tt_stats['hit_rate'] = round(tt_stats['hit_rate'], 4)
+    depth_times = {}
+    branching = []
+    previous_nodes = 0
+    previous_iteration_nodes = None
+    for info in iterations:
+        depth_times[info['depth']] = round(info['time'], 4)
+        iteration_nodes = info['nodes'] - previous_nodes
+        previous_nodes = info['nodes']
+        if previous_iteration_nodes:
+            branching.append(iteration_nodes / previous_iteration_nodes)
+        previous_iteration_nodes = iteration_nodes
+
+    return {
+        'fen': fen,
+        'best_move': move_to_text(move) if move else None,
+        'depth': iterations[-1]['depth'] if iterations else 0,
+        'score': iterations[-1]['score'] if iterations else None,
+        'nodes': ai.nodes_evaluated,
+        'time': round(elapsed, 4),
+        'nps': round(ai.nodes_evaluated / elapsed) if elapsed > 0 else 0,
+        'time_to_depth': depth_times,
+        'ebf': round(sum(branching) / len(branching), 3) if branching else None,
+        'tt': tt_stats,
+    }
+
+
+def run_bench(depth=None, time_limit=None, positions=BENCH_POSITIONS, engine_options=None):
+    """Benchmark every position; returns a dict with per-position results and totals"""
+    results = {}
+    for name, fen in positions:
+        results[name] = bench_position(fen, depth, time_limit, engine_options)
+    total_nodes = sum(result['nodes'] for result in results.values())
+    total_time = sum(result['time'] for result in results.values())
+    probes = sum(result['tt']['probes'] for result in results.values())
+    hits = sum(result['tt']['hits'] for result in results.values())
+    return {
+        'mode': 'time' if time_limit is not None else 'depth',
+        'depth': depth,
+        'time_limit': time_limit,
+        'positions': results,
+        'total_nodes': total_nodes,
+        'total_time': round(total_time, 4),
+        'nps': round(total_nodes / total_time) if total_time > 0 else 0,
+        'tt_hit_rate': round(hits / probes, 4) if probes else 0.0,
+        'tt_collisions': sum(result['tt']['collisions'] for result in results.values()),
+    }
+
+
+def print_report(report):
+    print(f"{'position':14s} {'move':6s} {'depth':>5s} {'nodes':>9s} {'time':>8s} {'nps':>8s} {'ebf':>6s} "
+          f"{'tt hit':>6s} {'coll':>6s}")
+    for name, result in report['positions'].items():
+        ebf = f"{result['ebf']:.2f}" if result['ebf'] is not None else '-'
+        print(f"{name:14s} {result['best_move'] or '-':6s} {result['depth']:5d} {result['nodes']:9d} "
+              f"{result['time']:8.3f} {result['nps']:8d} {ebf:>6s} "
+              f"{result['tt']['hit_rate']:6.1%} {result['tt']['collisions']:6d}")
+    print(f"\nTotal: {report['total_nodes']} nodes in {report['total_time']:.3f}s "
+          f"({report['nps']} nps), tt hit rate {report['tt_hit_rate']:.1%}, "
+          f"{report['tt_collisions']} collisions")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MiniChess search benchmark")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--depth', type=int, help="search every position to this depth (default 4)")
+    group.add_argument('--time', type=float, help="search every position for this many seconds")
+    parser.add_argument('--json', metavar='PATH', help="also write the results as JSON ('-' for stdout)")
+    parser.add_argument('--engine', default='', help="MiniChessAI attribute overrides, e.g. 'lmr_reduction=0'")
+    args = parser.parse_args(argv)
+
+    try:
+        engine_options = parse_engine_options(args.engine, defaults={})
+    except ValueError as error:
+        parser.error(f"--engine: {error}")
+
+    depth = None if args.time is not None else (args.depth or 4)
+    report = run_bench(depth=depth, time_limit=args.time, engine_options=engine_options)
+
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+        if args.json:
+            with open(args.json, 'w') as output:
+                json.dump(report, output, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
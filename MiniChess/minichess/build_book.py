@@ -0,0 +1,74 @@
+"""Build the opening book by searching every position in the first plies.
+
+    python -m minichess.build_book --plies 4 --depth 6
+    python -m minichess.build_book --output my.book --time 2.0
+
+Every distinct position reachable from the start in fewer than --plies
+plies is searched and its best move stored; the result is written as a
+sorted, memory-mappable book (see minichess.engine.book).
+"""
+import argparse
+import sys
+import time
+from .engine.board import ChessBoard
+from .engine.ai import MiniChessAI
+from .engine.book import DEFAULT_BOOK_PATH, write_book
+
+
+def collect_positions(plies):
+    """Distinct positions (as FEN) with fewer than plies moves played"""
+    positions = {}
+    frontier = [ChessBoard()]
+    for _ in range(plies):
+        next_frontier = []
+        for board in frontier:
+            key = board.zobrist_key
+            if key in positions:
+                continue
+            positions[key] = board.to_fen()
+            for move in board.get_all_valid_moves(board.current_turn):
+                child = board.copy()
+                child.make_move(move[0], move[1])
+                next_frontier.append(child)
+        frontier = next_frontier
+    return positions
+
+
+def build_book(plies, depth, time_limit=None, progress=None):
+    """Search each position; returns {zobrist_key: best_move}"""
+    positions = collect_positions(plies)
+    entries = {}
+    ai = MiniChessAI(depth=depth)
+    ai.time_limit = time_limit
+    for index, (key, fen) in enumerate(positions.items(), start=1):
+        board = ChessBoard.from_fen(fen)
+        move = ai.get_best_move(board, board.current_turn)
+        if move is not None:
+            entries[key] = move
+        if progress:
+            progress(index, len(positions))
+    return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the MiniChess opening book")
+    parser.add_argument('--plies', type=int, default=4, help="book covers positions before this ply")
+    parser.add_argument('--depth', type=int, default=6, help="search depth per position")
+    parser.add_argument('--time', type=float, default=None, help="optional time limit per position")
+    parser.add_argument('--output', default=DEFAULT_BOOK_PATH)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+
+    def progress(done, total):
+        if done % 50 == 0 or done == total:
+            print(f"{done}/{total} positions  {time.perf_counter() - start:.1f}s", flush=True)
+
+    entries = build_book(args.plies, args.depth, args.time, progress)
+    write_book(entries, args.output)
+    print(f"Wrote {len(entries)} entries to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""Generate endgame tablebases by retrograde analysis.
+
+    python -m minichess.build_tablebases --pieces 3
+    python -m minichess.build_tablebases --pieces 4 --output /tmp/tables
+    python -m minichess.build_tablebases --pieces 4 --only KRvKP,KQvKP
+
+Every material signature with up to --pieces pieces (kings included) is
+solved, smallest first, and written as one indexed table per signature
+(see minichess.engine.tablebase). There is no promotion or move-count
+rule in the 5x6 game, so a position is a draw exactly when neither side
+can force mate.
+
+Each table is solved in two passes. The first visits every position,
+scores checkmates, stalemates and captures (which lead into smaller,
+already solved tables) and counts the remaining moves. The second walks
+backwards from the mates one ply at a time: a position with a move into
+a lost position is won, and one whose moves all lead to won positions
+is lost, which also gives the distance to mate. Before it is written,
+each table is spot-checked (--verify) by working random positions out
+again from their moves.
+
+Solving runs over every placement of the pieces; the written table keeps
+one entry per position up to left-right mirroring (see
+minichess.engine.tablebase), and a signature that is drawn throughout is
+written as a header alone. --only limits the largest piece count to the
+listed signatures; the smaller ones they capture into are always built.
+
+The repository ships every 3-piece table and the 4-piece tables that
+search handles worst (KQvKP, KRvKP, KBvKP, KNvKP, KPvKP, KRvKN, KRvKB,
+KQvKR). For the full 4-piece set, about 21 MB and half an hour, run
+
+    python -m minichess.build_tablebases --pieces 4
+
+which writes to the directory open_default_tablebases() reads.
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+from .engine.board import ChessBoard
+from .engine.constants import COLS, ROWS
+from .engine.bitboard import NUM_SQUARES, SQUARE_POSITIONS, PAWN_PUSHES, piece_attacks
+from .engine.tablebase import (WIN, DRAW, LOSS, MAX_DTM, SIGNATURE_ORDER, TABLE_SUFFIX,
+                               DEFAULT_TABLEBASE_DIR, canonical_signature, decode_result,
+                               encode_result, material_signature, position_index,
+                               position_squares, signature_pieces, table_index, table_size,
+                               write_table)
+
+# Per-position state while solving
+UNSOLVED, SOLVED, ILLEGAL = 0, 1, 2
+# Move count of a position that can escape into a draw by capturing
+DRAW_ESCAPE = 255
+
+
+def signatures_up_to(max_pieces):
+    """Every canonical signature with 3..max_pieces pieces, smallest first"""
+    signatures = []
+    extra_types = SIGNATURE_ORDER[1:]
+    for piece_count in range(3, max_pieces + 1):
+        found = set()
+        for extra in itertools.combinations_with_replacement(extra_types, piece_count - 2):
+            for white_count in range(len(extra) + 1):
+                for white in itertools.combinations(extra, white_count):
+                    black = list(extra)
+                    for piece_type in white:
+                        black.remove(piece_type)
+                    found.add(canonical_signature(['king', *white], ['king', *black])[0])
+        signatures.extend(sorted(found, key=lambda name: (-len(name.split('v')[1]), name)))
+    return signatures
+
+
+def raw_table_size(piece_count):
+    """Entries needed to index every placement of piece_count pieces"""
+    return 2 * NUM_SQUARES ** piece_count
+
+
+def encode_index(stm, squares):
+    """Index among every placement for side to move stm and squares"""
+    index = stm
+    for square in squares:
+        index = index * NUM_SQUARES + square
+    return index
+
+
+def decode_index(index, piece_count):
+    """(stm, squares) for an index among every placement; stm is 0 for white to move"""
+    squares = []
+    for _ in range(piece_count):
+        index, square = divmod(index, NUM_SQUARES)
+        squares.append(square)
+    squares.reverse()
+    return index, squares
+
+
+class TableSolver:
+    """Solves one signature given the solved tables it can capture into.
+
+    solve and verify work on every placement of the pieces (decode_index);
+    compact turns the result into the table that is written and probed.
+    """
+    def __init__(self, signature, solved):
+        self.signature = signature
+        self.solved = solved
+        self.pieces = signature_pieces(signature)
+        self.board = ChessBoard([[None] * COLS for _ in range(ROWS)])
+        self._placed = []
+
+    def set_position(self, index):
+        """Put the indexed position on the board; False if it is not legal"""
+        board = self.board
+        for square, piece in self._placed:
+            board._remove(square, piece)
+        self._placed = []
+
+        stm, squares = decode_index(index, len(self.pieces))
+        if len(set(squares)) != len(squares):
+            return False
+        for square, piece in zip(squares, self.pieces):
+            board._place(square, piece)
+            self._placed.append((square, piece))
+            if piece[1] == 'pawn':
+                # Pawns never stand on their own back rank
+                row = SQUARE_POSITIONS[square][0]
+                if row == (ROWS - 1 if piece[0] == 'white' else 0):
+                    return False
+        board.current_turn = 'white' if stm == 0 else 'black'
+        waiting = 'black' if stm == 0 else 'white'
+        return not board.is_in_check(waiting)
+
+    def probe_capture(self):
+        """(outcome, dtm) of the board after a capture, from the smaller tables"""
+        board = self.board
+        if len(board.piece_squares['white']) + len(board.piece_squares['black']) == 2:
+            return DRAW, None
+        signature, flipped = material_signature(board)
+        return decode_result(self.solved[signature][position_index(board, signature, flipped)])
+
+    def predecessors(self, index):
+        """Indexes of positions one non-capture move before the indexed one"""
+        stm, squares = decode_index(index, len(self.pieces))
+        mover = 'black' if stm == 0 else 'white'
+        occupied = 0
+        for square in squares:
+            occupied |= 1 << square
+        base = (1 - stm) * NUM_SQUARES ** len(self.pieces)
+
+        result = []
+        for slot, (color, piece_type) in enumerate(self.pieces):
+            if color != mover:
+                continue
+            square = squares[slot]
+            if piece_type == 'pawn':
+                # A pawn came from the square behind it
+                other = 'black' if color == 'white' else 'white'
+                sources = PAWN_PUSHES[other][square] & ~occupied
+            else:
+                sources = piece_attacks(square, color, piece_type, occupied) & ~occupied
+            weight = NUM_SQUARES ** (len(self.pieces) - 1 - slot)
+            rest = index - stm * NUM_SQUARES ** len(self.pieces) - square * weight
+            while sources:
+                low_bit = sources & -sources
+                sources ^= low_bit
+                result.append(base + rest + (low_bit.bit_length() - 1) * weight)
+        return result
+
+    def solve(self):
+        size = raw_table_size(len(self.pieces))
+        state = bytearray(size)
+        values = bytearray(size)
+        remaining = bytearray(size)
+        longest = bytearray(size)
+        buckets = {}
+        board = self.board
+
+        for index in range(size):
+            if not self.set_position(index):
+                state[index] = ILLEGAL
+                continue
+            moves = board.get_all_valid_moves(board.current_turn)
+            if not moves:
+                if board.is_in_check(board.current_turn):
+                    buckets.setdefault(0, []).append((index, LOSS))
+                else:
+                    state[index] = SOLVED
+                continue
+
+            count = len(moves)
+            wins = draws = False
+            for from_pos, to_pos in moves:
+                if board.board[to_pos[0]][to_pos[1]] is None:
+                    continue
+                board.make_move(from_pos, to_pos)
+                outcome, dtm = self.probe_capture()
+                board.unmake_move()
+                if outcome == LOSS:
+                    buckets.setdefault(dtm + 1, []).append((index, WIN))
+                    wins = True
+                elif outcome == WIN:
+                    count -= 1
+                    longest[index] = max(longest[index], dtm)
+                else:
+                    draws = True
+            if draws and not wins:
+                count = DRAW_ESCAPE
+            remaining[index] = count
+            if count == 0:
+                buckets.setdefault(longest[index] + 1, []).append((index, LOSS))
+
+        level = 0
+        while buckets:
+            for index, outcome in buckets.pop(level, ()):
+                if state[index] != UNSOLVED:
+                    continue
+                if level > MAX_DTM:
+                    raise ValueError(f"{self.signature}: mate in {level} plies does not fit the table")
+                state[index] = SOLVED
+                values[index] = encode_result(outcome, level)
+                for parent in self.predecessors(index):
+                    if state[parent] != UNSOLVED:
+                        continue
+                    if outcome == LOSS:
+                        buckets.setdefault(level + 1, []).append((parent, WIN))
+                    elif remaining[parent] != DRAW_ESCAPE:
+                        remaining[parent] -= 1
+                        longest[parent] = max(longest[parent], level)
+                        if remaining[parent] == 0:
+                            buckets.setdefault(longest[parent] + 1, []).append((parent, LOSS))
+            level += 1
+        return values
+
+    def expected_result(self, values, index):
+        """(outcome, dtm) of the indexed position worked out from its moves,
+        or None if it is not a legal position.
+
+        Captures are read from the smaller tables and other moves from
+        values, so a solved table must agree with this at every index.
+        """
+        if not self.set_position(index):
+            return None
+        board = self.board
+        moves = board.get_all_valid_moves(board.current_turn)
+        if not moves:
+            return (LOSS, 0) if board.is_in_check(board.current_turn) else (DRAW, None)
+
+        results = []
+        for from_pos, to_pos in moves:
+            capture = board.board[to_pos[0]][to_pos[1]] is not None
+            board.make_move(from_pos, to_pos)
+            if capture:
+                results.append(self.probe_capture())
+            else:
+                results.append(decode_result(values[encode_index(
+                    *position_squares(board, self.signature, False))]))
+            board.unmake_move()
+
+        losses = [dtm for outcome, dtm in results if outcome == LOSS]
+        if losses:
+            return WIN, min(losses) + 1
+        if all(outcome == WIN for outcome, _ in results):
+            return LOSS, max(dtm for _, dtm in results) + 1
+        return DRAW, None
+
+    def verify(self, values, samples, seed=0):
+        """Check values against expected_result at up to samples random
+        positions; returns the indexes that disagree"""
+        rng = random.Random(seed)
+        size = raw_table_size(len(self.pieces))
+        mismatches = []
+        checked = attempts = 0
+        while checked < samples and attempts < 20 * samples:
+            attempts += 1
+            index = rng.randrange(size)
+            expected = self.expected_result(values, index)
+            if expected is None:
+                continue
+            checked += 1
+            if decode_result(values[index]) != expected:
+                mismatches.append(index)
+        return mismatches
+
+    def compact(self, values):
+        """The table to write for values from solve"""
+        table = bytearray(table_size(self.signature))
+        piece_count = len(self.pieces)
+        for index, value in enumerate(values):
+            if value:
+                table[table_index(self.signature, *decode_index(index, piece_count))] = value
+        return table
+
+
+def build_tablebases(max_pieces, directory, progress=None, verify_samples=0, only=None):
+    """Solve and write every signature up to max_pieces; returns {signature: table}.
+
+    With verify_samples, each table is checked against its moves at that
+    many random positions before it is written, and ValueError is raised
+    if any disagree. only, if given, restricts the max_pieces signatures.
+    """
+    solved = {}
+    for signature in signatures_up_to(max_pieces):
+        if only is not None and len(signature) - 1 == max_pieces and signature not in only:
+            continue
+        start = time.perf_counter()
+        solver = TableSolver(signature, solved)
+        values = solver.solve()
+        if verify_samples:
+            mismatches = solver.verify(values, verify_samples)
+            if mismatches:
+                solver.set_position(mismatches[0])
+                raise ValueError(f"{signature}: {len(mismatches)} of {verify_samples} sampled positions "
+                                 f"disagree with their moves, e.g. {solver.board.to_fen()}")
+        solved[signature] = solver.compact(values)
+        write_table(os.path.join(directory, signature + TABLE_SUFFIX), signature, solved[signature])
+        if progress:
+            progress(signature, solved[signature], time.perf_counter() - start)
+    return solved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate MiniChess endgame tablebases")
+    parser.add_argument('--pieces', type=int, default=3, help="largest piece count, kings included")
+    parser.add_argument('--output', default=DEFAULT_TABLEBASE_DIR, help="directory for the table files")
+    parser.add_argument('--verify', type=int, default=20000, metavar='N',
+                        help="check each table at N random positions (0 to skip)")
+    parser.add_argument('--only', metavar='SIGNATURES',
+                        help="comma-separated signatures to build at the largest piece count")
+    args = parser.parse_args(argv)
+    only = None
+    if args.only:
+        only = set(args.only.split(','))
+        if not only <= set(signatures_up_to(args.pieces)) or any(
+                len(signature) - 1 != args.pieces for signature in only):
+            parser.error(f"--only takes {args.pieces}-piece signatures such as KRvKP")
+
+    def progress(signature, values, elapsed):
+        wins = sum(1 for value in values if 0 < value < 128)
+        losses = sum(1 for value in values if value >= 128)
+        longest = max((decode_result(value)[1] for value in values if value), default=0)
+        print(f"{signature:8} {wins:8} won {losses:8} lost  longest mate {longest:3} plies  "
+              f"{elapsed:.1f}s", flush=True)
+
+    build_tablebases(args.pieces, args.output, progress, args.verify, only)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
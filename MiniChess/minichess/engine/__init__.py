@@ -0,0 +1,2 @@
+from .board import ChessBoard
+from .ai import MiniChessAI
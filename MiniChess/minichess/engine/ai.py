@@ -0,0 +1,730 @@
+from .board import ChessBoard
+from .bitboard import PIECE_TYPES, SQUARE_BITS, SQUARE_POSITIONS, square_index, iter_squares
+from .transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from .evaluation import PIECE_VALUES
+from .tablebase import WIN, LOSS, MAX_DTM
+import time
+
+# Deepest ply the PV table holds; iterations stop at MAX_PLY - 1
+MAX_PLY = 128
+# A mate n plies from the root scores MATE_SCORE - n for the winner.
+# Tablebase mates can lie beyond the search horizon, so forced-mate scores
+# reach down to MATE_SCORE - MAX_PLY - MAX_DTM.
+MATE_SCORE = 100000
+MATE_THRESHOLD = MATE_SCORE - MAX_PLY - MAX_DTM
+
+# Move ordering priorities: history scores stay below HISTORY_LIMIT, so
+# every band sorts ahead of the one after it.
+PV_MOVE_PRIORITY = 3000000
+CAPTURE_PRIORITY = 2000000
+KILLER_PRIORITY = 1000000
+HISTORY_LIMIT = 500000
+KILLERS_PER_PLY = 2
+ORDERING_RANKS = {'pawn': 1, 'knight': 2, 'bishop': 3, 'rook': 4, 'queen': 5, 'king': 6}
+
+def _score_to_tt(score, ply):
+    """Score to store for a node at ply: mates are counted from the node,
+    so the entry holds at whatever ply the position is reached again"""
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    """Inverse of _score_to_tt for a node at ply"""
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time limit runs out"""
+
+
+class MiniChessAI:
+    """Iterative-deepening alpha-beta engine.
+    
+    With workers > 1 the root moves of each iteration are split across a
+    process pool. selective_search=False switches off null move, late move
+    reductions, futility pruning and cutoffs from deeper transposition
+    entries; the score of every move then depends only on the position
+    and depth, and a parallel search returns the same move as a serial one
+    at a fixed depth. With selective search on (the default) the two can
+    differ, since each process prunes against its own tables.
+    """
+    def __init__(self, depth=3, tt_size_mb=16, workers=1, selective_search=True):
+        self.max_depth = depth  
+        self.workers = workers
+        self.tt_size_mb = tt_size_mb
+        self._pool = None
+        self._pool_stop = None
+        self._parallel_searches = 0
+        self.time_limit = 1.0 
+        self.check_interval = 256
+        self.aspiration_window = 50
+        self.use_quiescence = True
+        # Selective search; a reduction or depth of 0 turns a technique off,
+        # and selective_search=False turns all of them off (see above).
+        self.selective_search = selective_search
+        self.null_move_reduction = 2
+        self.null_move_min_depth = 3
+        self.lmr_reduction = 1
+        self.lmr_min_depth = 3
+        self.lmr_full_moves = 3
+        self.futility_depth = 2
+        self.futility_margin = 150
+        self.deadline = None
+        self.node_limit = None
+        self.node_deadline = None
+        self.search_start_nodes = 0
+        self.stop_requested = False
+        # In a parallel search worker, the pool's shared stop signal
+        self.stop_event = None
+        self.pondering = False
+        self.info_callback = None
+        self.nodes_evaluated = 0
+        self.tt = TranspositionTable(tt_size_mb)
+        self.book = None
+        self.tablebases = None
+        self.killers = {}
+        self._killers_game_ply = None
+        self.history = {'white': {}, 'black': {}}
+        # pv_table[ply] holds the best line found from the node at ply;
+        # principal_variation is the root's line from the last iteration.
+        self.pv_table = [[] for _ in range(MAX_PLY + 1)]
+        self.principal_variation = []
+        self._pv_moves = {}
+
+    def evaluate_board(self, board, current_turn):
+        if isinstance(board, list):
+            board = ChessBoard(board)
+
+        opponent = 'black' if current_turn == 'white' else 'white'
+
+        # Material and piece-square terms are kept up to date by the board.
+        score = board.piece_scores[current_turn] - board.piece_scores[opponent]
+
+        # Pseudo-legal mobility is close enough and skips legality filtering.
+        score += 0.1 * (self._get_mobility(board, current_turn) - self._get_mobility(board, opponent))
+
+        return score
+
+    def _get_mobility(self, board, color):
+        mobility = 0
+        for square, piece_type in board.piece_squares[color].items():
+            mobility += board._get_move_targets(square, color, piece_type).bit_count()
+        return mobility
+
+    def static_exchange(self, board, move):
+        """Material the side to move nets by capturing with move, if both sides
+        keep recapturing on the square with their least valuable attacker.
+        
+        Pieces uncovered behind an attacker join in; pins are ignored.
+        """
+        (from_row, from_col), (to_row, to_col) = move
+        grid = board.board
+        to_sq = square_index(to_row, to_col)
+        values = PIECE_VALUES
+        
+        gains = [values[grid[to_row][to_col][1]]]
+        on_square = values[grid[from_row][from_col][1]]
+        occupied = ((board.occupancy['white'] | board.occupancy['black'])
+                    ^ SQUARE_BITS[square_index(from_row, from_col)])
+        color = 'black' if board.current_turn == 'white' else 'white'
+        while True:
+            attackers = board.attackers_to(to_sq, occupied) & board.occupancy[color]
+            if not attackers:
+                break
+            for piece_type in PIECE_TYPES:
+                candidates = attackers & board.bitboards[(color, piece_type)]
+                if candidates:
+                    break
+            gains.append(on_square - gains[-1])
+            on_square = values[piece_type]
+            occupied ^= candidates & -candidates
+            color = 'black' if color == 'white' else 'white'
+        
+        # Either side may stop recapturing once it no longer pays
+        while len(gains) > 1:
+            last = gains.pop()
+            gains[-1] = -max(-gains[-1], last)
+        return gains[0]
+
+    def quiescence(self, board, alpha, beta, ply):
+        """Search captures only until the position is quiet.
+        
+        Scores are from the side to move's point of view. The side to move
+        may stand pat on the static evaluation, and captures that lose
+        material by static exchange are not searched.
+        """
+        self.nodes_evaluated += 1
+        if self.nodes_evaluated % self.check_interval == 0 and self._should_stop():
+            raise SearchTimeout()
+        
+        status = board.get_terminal_status()
+        if status is not None:
+            return self._terminal_score(status, ply)
+        
+        side = board.current_turn
+        best_eval = self.evaluate_board(board, side)
+        if best_eval >= beta:
+            return best_eval
+        alpha = max(alpha, best_eval)
+        
+        grid = board.board
+        values = PIECE_VALUES
+        captures = []
+        enemy = board.occupancy['black' if side == 'white' else 'white']
+        for square, piece_type in list(board.piece_squares[side].items()):
+            from_pos = SQUARE_POSITIONS[square]
+            for target in iter_squares(board._get_move_targets(square, side, piece_type) & enemy):
+                move = (from_pos, SQUARE_POSITIONS[target])
+                victim = grid[move[1][0]][move[1][1]]
+                if values[piece_type] > values[victim[1]] and self.static_exchange(board, move) < 0:
+                    continue
+                if not board._would_be_in_check(side, from_pos, move[1]):
+                    captures.append(move)
+        
+        for move in self.order_moves(board, captures, ply):
+            board.make_move(move[0], move[1])
+            eval = -self.quiescence(board, -beta, -alpha, ply + 1)
+            board.unmake_move()
+            if eval > best_eval:
+                best_eval = eval
+                if eval > alpha:
+                    alpha = eval
+                    if alpha >= beta:
+                        break
+        return best_eval
+
+    def negamax(self, board, depth, alpha, beta, ply=1, allow_null=True):
+        """Principal variation search; scores are for the side to move.
+        
+        The first move at each node is searched with the full window and
+        the rest with a null window around alpha, re-searched in full only
+        when one beats it. The best line from this node is left in
+        pv_table[ply].
+        """
+        self.nodes_evaluated += 1
+        if self.nodes_evaluated % self.check_interval == 0 and self._should_stop():
+            raise SearchTimeout()
+        if ply >= MAX_PLY:
+            return self.evaluate_board(board, board.current_turn)
+        self.pv_table[ply] = []
+        
+        key = board.zobrist_key
+        alpha_orig = alpha
+        hash_move = None
+        entry = self.tt.probe(key)
+        if entry is not None:
+            _, entry_depth, flag, score, hash_move, _ = entry
+            score = _score_from_tt(score, ply)
+            # A deeper entry is only used as a stand-in for this depth's
+            # score under selective search. Nodes with an open window are
+            # searched anyway, so their best line reaches pv_table.
+            pv_node = beta - alpha > 1
+            if not pv_node and (entry_depth == depth or (entry_depth > depth and self.selective_search)):
+                if flag == EXACT:
+                    return score
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score
+        hash_move = self._pv_moves.get(key, hash_move)
+        
+        if self.tablebases is not None:
+            result = self.tablebases.probe(board)
+            if result is not None:
+                return self._tablebase_score(result, ply)
+        
+        side = board.current_turn
+        if depth == 0:
+            if not self.use_quiescence:
+                status = board.get_terminal_status()
+                if status is not None:
+                    return self._terminal_score(status, ply)
+                return self.evaluate_board(board, side)
+            return self.quiescence(board, alpha, beta, ply)
+
+        moves = self.get_all_moves(board, side)
+        if not moves:
+            status = 'checkmate' if board.is_in_check(side) else 'stalemate'
+            score = self._terminal_score(status, ply)
+            self.tt.store(key, depth, EXACT, _score_to_tt(score, ply), None)
+            return score
+        moves = self.order_moves(board, moves, ply, hash_move)
+        in_check = board.is_in_check(side)
+        
+        # Null move: hand the opponent a free move. If a reduced search still
+        # fails high the real moves would too. Skipped in check and when the
+        # side has only king and pawns, where passing can be the best move.
+        selective = self.selective_search
+        if (selective and allow_null and self.null_move_reduction and depth >= self.null_move_min_depth
+                and not in_check and abs(beta) < MATE_THRESHOLD and self._has_pieces(board, side)):
+            board.make_null_move()
+            null_depth = max(depth - 1 - self.null_move_reduction, 0)
+            score = -self.negamax(board, null_depth, -beta, -beta + 1, ply + 1, False)
+            board.unmake_move()
+            if score >= beta:
+                return beta
+        
+        # Futility: near the leaves, quiet moves cannot bring a position this
+        # far behind back to the window, so they are not searched.
+        futility_value = None
+        if selective and depth <= self.futility_depth and not in_check and -MATE_THRESHOLD < alpha:
+            static_eval = self.evaluate_board(board, side)
+            if static_eval + self.futility_margin * depth <= alpha:
+                futility_value = static_eval + self.futility_margin * depth
+        
+        grid = board.board
+        best_move = None
+        best_eval = float('-inf')
+        searched = False
+        for index, move in enumerate(moves):
+            (to_row, to_col) = move[1]
+            quiet = grid[to_row][to_col] is None
+            late = (selective and index >= self.lmr_full_moves and depth >= self.lmr_min_depth
+                    and self.lmr_reduction and not in_check)
+            
+            board.make_move(move[0], move[1])
+            if quiet and (late or futility_value is not None):
+                quiet = not board.is_in_check(board.current_turn)
+            
+            if quiet and futility_value is not None:
+                board.unmake_move()
+                best_eval = max(best_eval, futility_value)
+                continue
+            
+            if not searched:
+                eval = -self.negamax(board, depth - 1, -beta, -alpha, ply + 1)
+                searched = True
+            else:
+                # Late move reduction: quiet moves ordered late get the null
+                # window search one or more plies shallower first.
+                reduction = self.lmr_reduction if quiet and late else 0
+                eval = -self.negamax(board, max(depth - 1 - reduction, 0),
+                                     -alpha - 1, -alpha, ply + 1)
+                if eval > alpha and reduction:
+                    eval = -self.negamax(board, depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < eval < beta:
+                    eval = -self.negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.unmake_move()
+            
+            if eval > best_eval:
+                best_eval = eval
+                best_move = move
+            if eval > alpha:
+                alpha = eval
+                self.pv_table[ply] = [move] + self.pv_table[ply + 1]
+                if alpha >= beta:
+                    self._record_cutoff(board, move, side, depth, ply)
+                    break
+        
+        if best_eval <= alpha_orig:
+            flag = UPPER_BOUND
+        elif best_eval >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, flag, _score_to_tt(best_eval, ply), best_move)
+        return best_eval
+
+    def _has_pieces(self, board, color):
+        """True if color has something besides its king and pawns"""
+        bitboards = board.bitboards
+        return any(bitboards[(color, piece_type)] for piece_type in ('knight', 'bishop', 'rook', 'queen'))
+
+    def _terminal_score(self, status, ply):
+        """Score of a finished position ply moves from the root, for the side
+        to move; faster mates score higher"""
+        if status == 'checkmate':
+            return -(MATE_SCORE - ply)
+        return 0
+
+    def _tablebase_score(self, result, ply):
+        """Score of a tablebase result for the side to move, on the same scale as
+        search mates: a mate dtm plies away scores as if found dtm plies deeper"""
+        outcome, dtm = result
+        if outcome == WIN:
+            return MATE_SCORE - ply - dtm
+        if outcome == LOSS:
+            return -(MATE_SCORE - ply - dtm)
+        return 0
+
+    def order_moves(self, board, moves, ply, pv_move=None):
+        """Sort moves: PV/hash move, MVV-LVA captures, killers, then quiet moves by history"""
+        grid = board.board
+        killers = self.killers.get(ply, ())
+        # The root is ordered without history, so a serial and a parallel
+        # search (whose history lives in the workers) try it in one order.
+        history = self.history[board.current_turn] if ply else {}
+        
+        def priority(move):
+            if move == pv_move:
+                return PV_MOVE_PRIORITY
+            (from_row, from_col), (to_row, to_col) = move
+            victim = grid[to_row][to_col]
+            if victim:
+                attacker = grid[from_row][from_col]
+                return (CAPTURE_PRIORITY + 10 * ORDERING_RANKS[victim[1]]
+                        - ORDERING_RANKS[attacker[1]])
+            if move in killers:
+                return KILLER_PRIORITY - killers.index(move)
+            return history.get(move, 0)
+        
+        return sorted(moves, key=priority, reverse=True)
+
+    def _record_cutoff(self, board, move, color, depth, ply):
+        """Update killer and history tables after a quiet move causes a cutoff"""
+        to_row, to_col = move[1]
+        if board.board[to_row][to_col]:
+            return
+        
+        killers = self.killers.setdefault(ply, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[KILLERS_PER_PLY:]
+        
+        history = self.history[color]
+        history[move] = history.get(move, 0) + depth * depth
+        if history[move] > HISTORY_LIMIT:
+            for key in history:
+                history[key] //= 2
+
+    def get_all_moves(self, board, color):
+        return board.get_all_valid_moves(color)
+
+    def get_best_move(self, board, current_color):
+        """Iterative deepening with aspiration windows and principal variation search"""
+        if self.book is not None and board.current_turn == current_color:
+            book_move = self.book.probe(board)
+            if book_move is not None and book_move in self.get_all_moves(board, current_color):
+                return book_move
+        if self.workers > 1:
+            return self._get_best_move_parallel(board, current_color)
+        best_move = None
+        best_eval = None
+        start_time = time.time()
+        self.deadline = start_time + self.time_limit if self.time_limit is not None else None
+        self.search_start_nodes = self.nodes_evaluated
+        self.node_deadline = (self.nodes_evaluated + self.node_limit
+                              if self.node_limit is not None else None)
+        self._shift_killers(board.ply)
+        self._age_history()
+        self.tt.new_search()
+        root_moves = self.get_all_moves(board, current_color)
+        if not root_moves:
+            return None
+        root_stack_size = board.stack_size
+        
+        # A kept table usually holds this position's move from the previous
+        # search's principal variation; try it first.
+        entry = self.tt.probe(board.zobrist_key)
+        if entry is not None and entry[4] in root_moves:
+            best_move = entry[4]
+        
+        # max_depth is read every iteration, so ponderhit can change it
+        for depth in range(1, MAX_PLY):
+            if depth > self.max_depth:
+                break
+            # Aspiration window around the last score; widen to a full
+            # window on whichever side the result falls outside it.
+            alpha, beta = float('-inf'), float('inf')
+            if best_eval is not None and abs(best_eval) < MATE_THRESHOLD:
+                alpha, beta = best_eval - self.aspiration_window, best_eval + self.aspiration_window
+            
+            self._partial_best_move = None
+            try:
+                while True:
+                    root_moves = self.order_moves(board, root_moves, 0, best_move)
+                    current_best_eval, current_best_move = self._search_root(
+                        board, root_moves, depth, current_color, alpha, beta)
+                    if current_best_eval <= alpha:
+                        alpha = float('-inf')
+                    elif current_best_eval >= beta:
+                        beta = float('inf')
+                    else:
+                        break
+            except SearchTimeout:
+                board.unmake_to(root_stack_size)
+                if self._partial_best_move is not None:
+                    best_move = self._partial_best_move
+                break
+            
+            best_move = current_best_move
+            best_eval = current_best_eval
+            self._load_pv(board)
+            self._report_iteration(depth, best_eval, best_move, start_time)
+            if self._should_stop():
+                break
+        
+        return best_move if best_move is not None else root_moves[0]
+
+    def _get_best_move_parallel(self, board, current_color):
+        """Iterative deepening with the root moves split across a process pool.
+        
+        Each iteration searches the first root move with a full window,
+        then hands the rest to the workers with a null window on its score.
+        Those that fail high are searched again with the window open
+        above it, and the first move in root order with the best score is
+        picked, as in the serial search. The root is ordered the same way
+        in both, so with selective_search=False they pick the same move.
+        
+        stop() reaches the workers through an event shared with the pool,
+        and node_limit is split evenly between the workers.
+        """
+        best_move = None
+        start_time = time.time()
+        deadline = start_time + self.time_limit if self.time_limit is not None else None
+        self.search_start_nodes = self.nodes_evaluated
+        self.tt.new_search()
+        root_moves = self.get_all_moves(board, current_color)
+        if not root_moves:
+            return None
+        entry = self.tt.probe(board.zobrist_key)
+        if entry is not None and entry[4] in root_moves:
+            best_move = entry[4]
+        
+        pool = self._get_pool()
+        # Cleared before stop_requested is read, so a stop() that comes in
+        # between still sets it.
+        self._pool_stop.clear()
+        if self.stop_requested:
+            self._pool_stop.set()
+        self._parallel_searches += 1
+        node_budget = self.node_limit // self.workers if self.node_limit is not None else None
+        settings = {name: getattr(self, name) for name in WORKER_SETTINGS}
+        grid = board.copy_board()
+        
+        def search(moves, depth, alpha, beta):
+            tasks = [(grid, board.current_turn, move, depth, alpha, beta, deadline,
+                      self._parallel_searches, node_budget, settings) for move in moves]
+            results = pool.map(_search_root_move, tasks, chunksize=1)
+            self.nodes_evaluated += sum(nodes for _, _, nodes in results)
+            return {move: (score, pv) for move, (score, pv, _) in zip(moves, results)
+                    if score is not None}
+        
+        for depth in range(1, MAX_PLY):
+            if depth > self.max_depth:
+                break
+            root_moves = self.order_moves(board, root_moves, 0, best_move)
+            first = root_moves[0]
+            results = search([first], depth, float('-inf'), float('inf'))
+            if first not in results:
+                break
+            best_score, best_pv = results[first]
+            rest = search(root_moves[1:], depth, best_score, best_score + 1)
+            better = [move for move in root_moves[1:]
+                      if move in rest and rest[move][0] > best_score]
+            exact = search(better, depth, best_score, float('inf')) if better else {}
+            finished = len(rest) == len(root_moves) - 1 and len(exact) == len(better)
+            
+            # A move cut short by the time limit is left out; the first move
+            # is the previous best, so whatever beats it here is an improvement.
+            best_move = first
+            for move in better:
+                if move in exact and exact[move][0] > best_score:
+                    best_score, best_pv = exact[move]
+                    best_move = move
+            if not finished:
+                break
+            self.principal_variation = [best_move] + best_pv
+            self.tt.store(board.zobrist_key, depth, EXACT, best_score, best_move)
+            self._report_iteration(depth, best_score, best_move, start_time)
+            if self._pool_stop.is_set() or (deadline is not None and time.time() >= deadline):
+                break
+        
+        return best_move if best_move is not None else root_moves[0]
+
+    def _get_pool(self):
+        if self._pool is None:
+            # Imported here: multiprocessing is the slowest part of
+            # importing the engine and only parallel search needs it.
+            import multiprocessing
+            self._pool_stop = multiprocessing.Event()
+            self._pool = multiprocessing.Pool(
+                self.workers, initializer=_init_search_worker,
+                initargs=(self.tt_size_mb, self.tablebases, self._pool_stop))
+        return self._pool
+
+    def close(self):
+        """Shut down the worker processes used by parallel search"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+            self._pool_stop = None
+
+    def _report_iteration(self, depth, score, move, start_time):
+        if self.info_callback:
+            self.info_callback({
+                'depth': depth,
+                'score': score,
+                'move': move,
+                'pv': list(self.principal_variation) if self.principal_variation[:1] == [move] else [move],
+                'nodes': self.nodes_evaluated - self.search_start_nodes,
+                'time': time.time() - start_time,
+            })
+
+    def stop(self):
+        """Ask a running search to return as soon as possible (thread-safe)"""
+        self.stop_requested = True
+        pool_stop = self._pool_stop
+        if pool_stop is not None:
+            pool_stop.set()
+
+    def ponderhit(self, max_depth, time_limit):
+        """Turn a ponder search into a normal one with these limits, timed
+        from now (thread-safe)"""
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.deadline = time.time() + time_limit if time_limit is not None else None
+        self.pondering = False
+
+    def _should_stop(self):
+        if self.stop_requested:
+            return True
+        if self.stop_event is not None and self.stop_event.is_set():
+            return True
+        if self.pondering:
+            return False
+        if self.node_deadline is not None and self.nodes_evaluated >= self.node_deadline:
+            return True
+        return self.deadline is not None and time.time() >= self.deadline
+
+    def get_ponder_move(self, board):
+        """Expected reply in board's position, taken from the transposition table"""
+        entry = self.tt.probe(board.zobrist_key)
+        if entry is None or entry[4] is None:
+            return None
+        if entry[4] not in self.get_all_moves(board, board.current_turn):
+            return None
+        return entry[4]
+
+    def reset(self, clear_tables=True):
+        """Forget what earlier searches learned.
+        
+        Called with clear_tables=False after moves are taken back: the
+        transposition table is still valid for any position, but killer
+        and history scores came from a line that is no longer played.
+        """
+        self.killers = {}
+        self._killers_game_ply = None
+        self.history = {'white': {}, 'black': {}}
+        if clear_tables:
+            self.tt.clear()
+            self.principal_variation = []
+            self._pv_moves = {}
+
+    def _shift_killers(self, game_ply):
+        """Carry the killers over to a search from game_ply.
+        
+        Killers are kept by distance from the root, so after n more moves
+        in the game the killers for ply p + n are the ones for ply p now.
+        Those for plies already played are dropped.
+        """
+        last_ply = self._killers_game_ply
+        self._killers_game_ply = game_ply
+        if last_ply is None or game_ply < last_ply:
+            self.killers = {}
+            return
+        shift = game_ply - last_ply
+        self.killers = {ply - shift: moves for ply, moves in self.killers.items() if ply > shift}
+
+    def _age_history(self):
+        """Halve the history scores so a new search favours fresh cutoffs"""
+        for history in self.history.values():
+            for move in history:
+                history[move] //= 2
+
+    def _search_root(self, board, root_moves, depth, current_color, alpha, beta):
+        """Search the root moves in order; returns (best_eval, best_move)"""
+        best_eval = float('-inf')
+        best_move = None
+        for move in root_moves:
+            board.make_move(move[0], move[1])
+            if best_move is None:
+                eval = -self.negamax(board, depth - 1, -beta, -alpha)
+            else:
+                eval = -self.negamax(board, depth - 1, -alpha - 1, -alpha)
+                if alpha < eval < beta:
+                    eval = -self.negamax(board, depth - 1, -beta, -alpha)
+            board.unmake_move()
+            
+            if eval > best_eval:
+                best_eval = eval
+                best_move = move
+            if eval > alpha:
+                # A move that beats the window's lower bound is trustworthy
+                # even if the iteration is cut short after it.
+                alpha = eval
+                self._partial_best_move = move
+                self.principal_variation = [move] + self.pv_table[1]
+                if alpha >= beta:
+                    break
+        return best_eval, best_move
+
+    def _load_pv(self, board):
+        """Remember the move for each position along the principal variation,
+        so the next iteration (or search) tries it first there"""
+        self._pv_moves = {}
+        stack_size = board.stack_size
+        for move in self.principal_variation:
+            if move not in board.get_all_valid_moves(board.current_turn):
+                break
+            self._pv_moves[board.zobrist_key] = move
+            board.make_move(move[0], move[1])
+        board.unmake_to(stack_size)
+
+
+# Search settings a parallel search copies from its engine to the workers
+WORKER_SETTINGS = ('check_interval', 'use_quiescence', 'selective_search',
+                   'null_move_reduction', 'null_move_min_depth', 'lmr_reduction',
+                   'lmr_min_depth', 'lmr_full_moves', 'futility_depth', 'futility_margin')
+
+# Engine owned by each parallel search worker process; its tables persist
+# between the root moves handed to that process.
+_worker_ai = None
+_worker_search = None
+
+
+def _init_search_worker(tt_size_mb, tablebases, stop_event):
+    global _worker_ai
+    _worker_ai = MiniChessAI(tt_size_mb=tt_size_mb)
+    _worker_ai.tablebases = tablebases
+    _worker_ai.stop_event = stop_event
+
+
+def _search_root_move(task):
+    """Score one root move in the window (alpha, beta); returns
+    (score or None, principal variation after the move, nodes).
+    
+    The engine takes the master's settings at its first task of each
+    parallel search, and node_budget covers every task it runs for that
+    search.
+    """
+    global _worker_search
+    grid, turn, move, depth, alpha, beta, deadline, search, node_budget, settings = task
+    board = ChessBoard(grid)
+    board.current_turn = turn
+    board.make_move(move[0], move[1])
+    ai = _worker_ai
+    ai.deadline = deadline
+    if search != _worker_search:
+        _worker_search = search
+        for name, value in settings.items():
+            setattr(ai, name, value)
+        ai.node_deadline = ai.nodes_evaluated + node_budget if node_budget is not None else None
+        ai.tt.new_search()
+    nodes_before = ai.nodes_evaluated
+    try:
+        score = -ai.negamax(board, depth - 1, -beta, -alpha)
+    except SearchTimeout:
+        return None, [], ai.nodes_evaluated - nodes_before
+    return score, list(ai.pv_table[1]), ai.nodes_evaluated - nodes_before
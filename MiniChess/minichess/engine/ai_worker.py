@@ -0,0 +1,156 @@
+import queue
+import threading
+from .ai import MiniChessAI
+from .book import open_default_book
+from .tablebase import open_default_tablebases
+
+
+class AIWorker:
+    """Runs MiniChessAI searches on a background thread.
+    
+    Progress and results are posted to a queue as (kind, search_id, data)
+    tuples, where kind is 'info' or 'bestmove'; the game loop drains it
+    with poll(). Starting or cancelling a search discards anything still
+    queued from the previous one.
+    
+    Each side gets one engine that lives for the whole game, so its
+    transposition, killer and history tables carry over from move to move
+    (killers shifted by the plies played since); new_game and takeback are
+    the hooks for clearing them.
+    
+    While the opponent is thinking the worker can ponder: it plays the
+    reply it expects and searches the position after it. If the opponent
+    makes that move, start_search turns the ponder search into the real
+    one; otherwise the ponder search is dropped and the engine searches
+    the actual position with the tables it has filled.
+    """
+    def __init__(self):
+        self.messages = queue.Queue()
+        self.search_id = 0
+        self._engines = {}
+        self._ai = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._ponder_key = None
+        self._ponder_result = None
+        self.book = open_default_book()
+        self.tablebases = open_default_tablebases()
+    
+    @property
+    def busy(self):
+        """True while a search thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    @property
+    def pondering(self):
+        """True while a ponder search has been started and not resolved"""
+        return self._ponder_key is not None
+    
+    def start_search(self, board, color, depth=3, time_limit=1.0):
+        """Search a copy of board for color's best move; returns the search id.
+        
+        On a ponder hit the ponder search goes on under depth and
+        time_limit; one that already finished is only used if it went at
+        least depth plies deep.
+        """
+        if self._ponder_key is not None and self._ponder_key == board.zobrist_key:
+            self._ponder_key = None
+            with self._lock:
+                if self._ponder_result is None:
+                    self._ai.ponderhit(depth, time_limit)
+                    return self.search_id
+                if self._ai.max_depth >= depth:
+                    self.messages.put(('bestmove', self.search_id, self._ponder_result[0]))
+                    return self.search_id
+        
+        ai = self.engine(color)
+        self.cancel()
+        ai.max_depth = depth
+        ai.time_limit = time_limit
+        ai.pondering = False
+        return self._start(ai, board.copy(), color)
+    
+    def start_ponder(self, board, color, depth=3, time_limit=1.0):
+        """Search for color's answer to the expected reply in board's position.
+        
+        Uses color's engine, so it must follow a completed start_search
+        for color. Returns False if there is nothing to predict.
+        """
+        ai = self._engines.get(color)
+        if ai is None:
+            return False
+        self.cancel()
+        expected_reply = ai.get_ponder_move(board)
+        if expected_reply is None:
+            return False
+        
+        ponder_board = board.copy()
+        ponder_board.make_move(*expected_reply)
+        ai.max_depth = depth
+        ai.time_limit = time_limit
+        ai.pondering = True
+        self._ponder_key = ponder_board.zobrist_key
+        self._start(ai, ponder_board, color)
+        return True
+    
+    def engine(self, color):
+        """The engine that plays color, created on first use"""
+        ai = self._engines.get(color)
+        if ai is None:
+            ai = MiniChessAI()
+            ai.book = self.book
+            ai.tablebases = self.tablebases
+            self._engines[color] = ai
+        return ai
+    
+    def new_game(self):
+        """Stop searching and clear every engine's tables"""
+        self.cancel()
+        for ai in self._engines.values():
+            ai.reset()
+    
+    def takeback(self):
+        """Stop searching after moves were taken back or replayed"""
+        self.cancel()
+        for ai in self._engines.values():
+            ai.reset(clear_tables=False)
+    
+    def _start(self, ai, board, color):
+        self.search_id += 1
+        self._ai = ai
+        self._ponder_result = None
+        self._thread = threading.Thread(
+            target=self._run, args=(ai, board, color, self.search_id), daemon=True)
+        self._thread.start()
+        return self.search_id
+    
+    def _run(self, ai, board, color, search_id):
+        ai.info_callback = lambda info: self.messages.put(('info', search_id, info))
+        move = ai.get_best_move(board, color)
+        with self._lock:
+            if ai.pondering:
+                self._ponder_result = (move,)
+            else:
+                self.messages.put(('bestmove', search_id, move))
+    
+    def cancel(self):
+        """Stop the running search, if any, and forget its results"""
+        if self._thread is not None:
+            self._ai.stop()
+            self._thread.join()
+            self._ai.stop_requested = False
+        self._thread = None
+        self._ponder_key = None
+        self._ponder_result = None
+        self.search_id += 1
+    
+    def poll(self):
+        """Return the queued messages that belong to the current search"""
+        messages = []
+        while True:
+            try:
+                kind, search_id, data = self.messages.get_nowait()
+            except queue.Empty:
+                return messages
+            if search_id == self.search_id:
+                messages.append((kind, data))
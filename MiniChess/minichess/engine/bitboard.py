@@ -0,0 +1,143 @@
+from .constants import COLS, ROWS
+
+# Square index of (row, col) is row * COLS + col, so bit 0 is the a6 corner
+# (black's back rank) and bit NUM_SQUARES - 1 is e1.
+NUM_SQUARES = ROWS * COLS
+FULL_BOARD = (1 << NUM_SQUARES) - 1
+
+COLORS = ('white', 'black')
+PIECE_TYPES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+
+KNIGHT_OFFSETS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+                  (1, -2), (1, 2), (2, -1), (2, 1)]
+KING_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1),
+                (0, 1), (1, -1), (1, 0), (1, 1)]
+ORTHOGONAL_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+DIAGONAL_DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+PAWN_DIRECTION = {'white': -1, 'black': 1}
+
+
+def square_index(row, col):
+    """Convert a (row, col) pair to a square index"""
+    return row * COLS + col
+
+
+def square_position(square):
+    """Convert a square index back to a (row, col) pair"""
+    return divmod(square, COLS)
+
+
+SQUARE_POSITIONS = [square_position(sq) for sq in range(NUM_SQUARES)]
+SQUARE_BITS = [1 << sq for sq in range(NUM_SQUARES)]
+
+
+def iter_squares(bitboard):
+    """Yield the square index of every set bit, lowest first"""
+    while bitboard:
+        low_bit = bitboard & -bitboard
+        yield low_bit.bit_length() - 1
+        bitboard ^= low_bit
+
+
+def lowest_square(bitboard):
+    """Square index of the lowest set bit"""
+    return (bitboard & -bitboard).bit_length() - 1
+
+
+def highest_square(bitboard):
+    """Square index of the highest set bit"""
+    return bitboard.bit_length() - 1
+
+
+def _offset_table(offsets):
+    table = []
+    for sq in range(NUM_SQUARES):
+        row, col = square_position(sq)
+        mask = 0
+        for dr, dc in offsets:
+            r, c = row + dr, col + dc
+            if 0 <= r < ROWS and 0 <= c < COLS:
+                mask |= 1 << square_index(r, c)
+        table.append(mask)
+    return table
+
+
+def _pawn_tables():
+    attacks = {}
+    pushes = {}
+    for color, direction in PAWN_DIRECTION.items():
+        attacks[color] = _offset_table([(direction, -1), (direction, 1)])
+        pushes[color] = _offset_table([(direction, 0)])
+    return attacks, pushes
+
+
+def _ray_table(direction):
+    dr, dc = direction
+    table = []
+    for sq in range(NUM_SQUARES):
+        row, col = square_position(sq)
+        mask = 0
+        r, c = row + dr, col + dc
+        while 0 <= r < ROWS and 0 <= c < COLS:
+            mask |= 1 << square_index(r, c)
+            r, c = r + dr, c + dc
+        table.append(mask)
+    return table
+
+
+KNIGHT_ATTACKS = _offset_table(KNIGHT_OFFSETS)
+KING_ATTACKS = _offset_table(KING_OFFSETS)
+PAWN_ATTACKS, PAWN_PUSHES = _pawn_tables()
+
+# A ray runs towards increasing square indices when the direction moves down
+# the board, or along the row to the right; the first blocker on such a ray is
+# its lowest set bit, otherwise it is the highest.
+RAYS = {direction: _ray_table(direction)
+        for direction in ORTHOGONAL_DIRECTIONS + DIAGONAL_DIRECTIONS}
+RAY_IS_ASCENDING = {(dr, dc): dr > 0 or (dr == 0 and dc > 0) for (dr, dc) in RAYS}
+
+
+def ray_attacks(square, occupied, directions):
+    """Squares reached by sliding from square along directions until blocked"""
+    attacks = 0
+    for direction in directions:
+        ray = RAYS[direction][square]
+        blockers = ray & occupied
+        if blockers:
+            if RAY_IS_ASCENDING[direction]:
+                blocker = lowest_square(blockers)
+            else:
+                blocker = highest_square(blockers)
+            ray ^= RAYS[direction][blocker]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(square, occupied):
+    """Rook attack set from square given the occupied squares"""
+    return ray_attacks(square, occupied, ORTHOGONAL_DIRECTIONS)
+
+
+def bishop_attacks(square, occupied):
+    """Bishop attack set from square given the occupied squares"""
+    return ray_attacks(square, occupied, DIAGONAL_DIRECTIONS)
+
+
+def queen_attacks(square, occupied):
+    """Queen attack set from square given the occupied squares"""
+    return ray_attacks(square, occupied, ORTHOGONAL_DIRECTIONS + DIAGONAL_DIRECTIONS)
+
+
+def piece_attacks(square, color, piece_type, occupied):
+    """Attack set of a piece standing on square (pawn captures only)"""
+    if piece_type == 'pawn':
+        return PAWN_ATTACKS[color][square]
+    if piece_type == 'knight':
+        return KNIGHT_ATTACKS[square]
+    if piece_type == 'king':
+        return KING_ATTACKS[square]
+    if piece_type == 'rook':
+        return rook_attacks(square, occupied)
+    if piece_type == 'bishop':
+        return bishop_attacks(square, occupied)
+    return queen_attacks(square, occupied)
@@ -0,0 +1,637 @@
+from array import array
+from .constants import COLS, ROWS
+from .bitboard import (COLORS, PIECE_TYPES, SQUARE_BITS, SQUARE_POSITIONS,
+                      PAWN_ATTACKS, PAWN_PUSHES, KNIGHT_ATTACKS, KING_ATTACKS,
+                      RAYS, RAY_IS_ASCENDING, ORTHOGONAL_DIRECTIONS, DIAGONAL_DIRECTIONS,
+                      square_index, iter_squares, piece_attacks, rook_attacks, bishop_attacks)
+from .zobrist import PIECE_SQUARE_KEYS, BLACK_TO_MOVE_KEY
+from .evaluation import PIECE_SQUARE_SCORES
+
+PIECE_SYMBOLS = {
+    'pawn': 'P', 'rook': 'R', 'knight': 'N',
+    'bishop': 'B', 'queen': 'Q', 'king': 'K'
+}
+SYMBOL_PIECES = {symbol: piece_type for piece_type, symbol in PIECE_SYMBOLS.items()}
+START_FEN = 'rnbqk/ppppp/5/5/PPPPP/RNBQK w'
+
+# A move packs into 16 bits: from square (bits 0-4), to square (bits 5-9),
+# captured piece code (bits 10-13, 0 for none) and flags (bits 14-15).
+MOVE_TYPECODE = 'H'
+TO_SHIFT = 5
+CAPTURE_SHIFT = 10
+FLAGS_SHIFT = 14
+SQUARE_MASK = 0x1F
+PIECE_MASK = 0xF
+CHECK_FLAG = 1
+PIECE_CODES = {(color, piece_type): code for code, (color, piece_type) in enumerate(
+    ((color, piece_type) for color in COLORS for piece_type in PIECE_TYPES), start=1)}
+CODE_PIECES = {code: piece for piece, code in PIECE_CODES.items()}
+
+
+def square_name(pos):
+    """Algebraic name of a (row, col) position, e.g. (5, 0) -> 'a1'"""
+    row, col = pos
+    return f"{chr(97 + col)}{ROWS - row}"
+
+
+def parse_square(name):
+    """(row, col) position of an algebraic square name"""
+    col = ord(name[0]) - 97
+    row = ROWS - int(name[1:])
+    if not (0 <= row < ROWS and 0 <= col < COLS):
+        raise ValueError(f"Invalid square: {name}")
+    return (row, col)
+
+
+def move_to_text(move):
+    """Coordinate notation for a (from, to) move, e.g. 'a2a3'"""
+    return square_name(move[0]) + square_name(move[1])
+
+
+def parse_move(text):
+    """(from, to) move from coordinate notation"""
+    return (parse_square(text[:2]), parse_square(text[2:]))
+
+
+def encode_move(from_pos, to_pos, captured=None, flags=0):
+    """Pack a move, the piece it captured and its flags into one integer"""
+    code = square_index(*from_pos) | (square_index(*to_pos) << TO_SHIFT)
+    if captured:
+        code |= PIECE_CODES[captured] << CAPTURE_SHIFT
+    return code | (flags << FLAGS_SHIFT)
+
+
+def decode_move(code):
+    """(from_pos, to_pos, captured, flags) for a packed move"""
+    return (SQUARE_POSITIONS[code & SQUARE_MASK],
+            SQUARE_POSITIONS[(code >> TO_SHIFT) & SQUARE_MASK],
+            CODE_PIECES.get((code >> CAPTURE_SHIFT) & PIECE_MASK),
+            code >> FLAGS_SHIFT)
+
+
+class ChessBoard:
+    def __init__(self, grid=None):
+        self.board = grid if grid is not None else self.setup_board()
+        self.move_history = array(MOVE_TYPECODE)
+        self._redo_moves = array(MOVE_TYPECODE)
+        self._undo_stack = []
+        self._terminal_cache = (None, None)
+        self.current_turn = 'white'
+        self.last_moved_piece = None
+        self.game_over = False
+        self.winner = None
+    
+    @property
+    def board(self):
+        """The 6x5 grid of (color, piece_type) tuples"""
+        return self._grid
+    
+    @board.setter
+    def board(self, grid):
+        self._grid = grid
+        self._sync_bitboards()
+    
+    def _sync_bitboards(self):
+        """Rebuild the bitboards from the grid"""
+        self.bitboards = {(color, piece_type): 0
+                          for color in COLORS for piece_type in PIECE_TYPES}
+        self.occupancy = {color: 0 for color in COLORS}
+        self.piece_squares = {color: {} for color in COLORS}
+        self.king_squares = {color: None for color in COLORS}
+        self.piece_scores = {color: 0 for color in COLORS}
+        self._piece_key = 0
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = self._grid[row][col]
+                if piece:
+                    square = square_index(row, col)
+                    bit = SQUARE_BITS[square]
+                    self.bitboards[piece] |= bit
+                    self.occupancy[piece[0]] |= bit
+                    self.piece_squares[piece[0]][square] = piece[1]
+                    if piece[1] == 'king':
+                        self.king_squares[piece[0]] = square
+                    self.piece_scores[piece[0]] += PIECE_SQUARE_SCORES[piece][square]
+                    self._piece_key ^= PIECE_SQUARE_KEYS[piece][square]
+    
+    @property
+    def zobrist_key(self):
+        """64-bit hash of the piece placement and side to move"""
+        if self.current_turn == 'black':
+            return self._piece_key ^ BLACK_TO_MOVE_KEY
+        return self._piece_key
+    
+    def setup_board(self):
+        """Initialize the 5x6 chess board with pieces"""
+        board = [[None for _ in range(COLS)] for _ in range(ROWS)]
+        
+        for col in range(COLS):
+            board[1][col] = ('black', 'pawn')
+            board[4][col] = ('white', 'pawn')
+        
+        back_row = ['rook', 'knight', 'bishop', 'queen', 'king']
+        for col, piece in enumerate(back_row[:COLS]):
+            board[0][col] = ('black', piece)
+            board[5][col] = ('white', piece)
+            
+        return board
+    
+    def copy_board(self):
+        """Create a deep copy of the current board state"""
+        return [row.copy() for row in self.board]
+    
+    @classmethod
+    def from_fen(cls, fen):
+        """Create a board from a FEN-style string such as START_FEN.
+        
+        Ranks run from rank 6 (row 0) down to rank 1, followed by the side
+        to move ('w' or 'b').
+        """
+        fields = fen.split()
+        ranks = fields[0].split('/')
+        if len(ranks) != ROWS:
+            raise ValueError(f"Expected {ROWS} ranks in FEN: {fen}")
+        
+        grid = []
+        for rank in ranks:
+            row = []
+            for symbol in rank:
+                if symbol.isdigit():
+                    row.extend([None] * int(symbol))
+                elif symbol.upper() in SYMBOL_PIECES:
+                    color = 'white' if symbol.isupper() else 'black'
+                    row.append((color, SYMBOL_PIECES[symbol.upper()]))
+                else:
+                    raise ValueError(f"Invalid piece '{symbol}' in FEN: {fen}")
+            if len(row) != COLS:
+                raise ValueError(f"Expected {COLS} squares per rank in FEN: {fen}")
+            grid.append(row)
+        
+        board = cls(grid)
+        if len(fields) > 1:
+            board.current_turn = 'black' if fields[1] == 'b' else 'white'
+        return board
+    
+    def to_fen(self):
+        """Describe the position as a FEN-style string"""
+        ranks = []
+        for row in self._grid:
+            rank = ''
+            empty = 0
+            for piece in row:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                symbol = PIECE_SYMBOLS[piece[1]]
+                rank += symbol if piece[0] == 'white' else symbol.lower()
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+        return '/'.join(ranks) + (' w' if self.current_turn == 'white' else ' b')
+    
+    def copy(self):
+        """Create an independent ChessBoard in the same position"""
+        board = ChessBoard(self.copy_board())
+        board.move_history = array(MOVE_TYPECODE, self.move_history)
+        board._redo_moves = array(MOVE_TYPECODE, self._redo_moves)
+        board.current_turn = self.current_turn
+        board.last_moved_piece = self.last_moved_piece
+        board.game_over = self.game_over
+        board.winner = self.winner
+        return board
+    
+    def get_piece(self, row, col):
+        """Get the piece at the specified position"""
+        if 0 <= row < ROWS and 0 <= col < COLS:
+            return self._grid[row][col]
+        return None
+    
+    def set_piece(self, row, col, piece):
+        """Set a piece at the specified position"""
+        square = square_index(row, col)
+        old_piece = self._grid[row][col]
+        if old_piece:
+            self._remove(square, old_piece)
+        if piece:
+            self._place(square, piece)
+    
+    def _place(self, square, piece):
+        """Put piece on an empty square, keeping grid and bitboards in step"""
+        row, col = SQUARE_POSITIONS[square]
+        self._grid[row][col] = piece
+        bit = SQUARE_BITS[square]
+        self.bitboards[piece] |= bit
+        self.occupancy[piece[0]] |= bit
+        self.piece_squares[piece[0]][square] = piece[1]
+        if piece[1] == 'king':
+            self.king_squares[piece[0]] = square
+        self.piece_scores[piece[0]] += PIECE_SQUARE_SCORES[piece][square]
+        self._piece_key ^= PIECE_SQUARE_KEYS[piece][square]
+    
+    def _remove(self, square, piece):
+        """Take piece off square, keeping grid and bitboards in step"""
+        row, col = SQUARE_POSITIONS[square]
+        self._grid[row][col] = None
+        bit = SQUARE_BITS[square]
+        self.bitboards[piece] ^= bit
+        self.occupancy[piece[0]] ^= bit
+        del self.piece_squares[piece[0]][square]
+        if piece[1] == 'king':
+            self.king_squares[piece[0]] = None
+        self.piece_scores[piece[0]] -= PIECE_SQUARE_SCORES[piece][square]
+        self._piece_key ^= PIECE_SQUARE_KEYS[piece][square]
+    
+    def move_piece(self, from_pos, to_pos):
+        """Move a piece from one position to another"""
+        moved_piece = self._grid[from_pos[0]][from_pos[1]]
+        captured_piece = self._grid[to_pos[0]][to_pos[1]]
+        
+        color = moved_piece[0] if moved_piece else None
+        if color and self._would_be_in_check(color, from_pos, to_pos):
+            return False
+        
+        self._apply_move(square_index(*from_pos), square_index(*to_pos),
+                         moved_piece, captured_piece, to_pos)
+        self.check_game_end_conditions()
+        
+        flags = CHECK_FLAG if self.is_in_check(self.current_turn) else 0
+        self.move_history.append(encode_move(from_pos, to_pos, captured_piece, flags))
+        del self._redo_moves[:]
+        return True
+    
+    def undo_move(self):
+        """Undo the last move if available; redo_move can play it again.
+        
+        Everything needed is in the packed move: the captured piece is in
+        the code, the previous move gives last_moved_piece, and a position
+        that was moved from cannot have been over.
+        """
+        if not self.move_history:
+            return False
+        
+        code = self.move_history.pop()
+        self._redo_moves.append(code)
+        from_pos, to_pos, captured_piece, _ = decode_move(code)
+        from_sq = square_index(*from_pos)
+        to_sq = square_index(*to_pos)
+        moved_piece = self._grid[to_pos[0]][to_pos[1]]
+        if moved_piece:
+            self._remove(to_sq, moved_piece)
+            self._place(from_sq, moved_piece)
+        if captured_piece:
+            self._place(to_sq, captured_piece)
+        
+        self.current_turn = 'black' if self.current_turn == 'white' else 'white'
+        self.last_moved_piece = decode_move(self.move_history[-1])[1] if self.move_history else None
+        self.game_over = False
+        self.winner = None
+        return True
+    
+    def redo_move(self):
+        """Replay the last undone move, if no other move was made since.
+        
+        A position that was later moved from cannot be over, so the game
+        end is only looked for on reaching the end of the line.
+        """
+        if not self._redo_moves:
+            return False
+        
+        code = self._redo_moves.pop()
+        from_pos, to_pos, captured_piece, _ = decode_move(code)
+        self._apply_move(square_index(*from_pos), square_index(*to_pos),
+                         self._grid[from_pos[0]][from_pos[1]], captured_piece, to_pos)
+        self.move_history.append(code)
+        if not self._redo_moves:
+            self.check_game_end_conditions()
+        return True
+    
+    @property
+    def ply(self):
+        """Number of moves played in the game so far"""
+        return len(self.move_history)
+    
+    @property
+    def last_ply(self):
+        """Ply reached by redoing every undone move"""
+        return len(self.move_history) + len(self._redo_moves)
+    
+    def go_to_ply(self, ply):
+        """Undo or redo moves until ply moves have been played.
+        
+        Costs one step per ply travelled; returns False if ply lies outside
+        0..last_ply.
+        """
+        if not 0 <= ply <= self.last_ply:
+            return False
+        while len(self.move_history) > ply:
+            self.undo_move()
+        while len(self.move_history) < ply:
+            self.redo_move()
+        return True
+    
+    def make_move(self, from_pos, to_pos):
+        """Play a move in place without legality or game-end checks.
+        
+        Only the state needed to take the move back is saved; every call
+        must be paired with unmake_move. Game moves (move_piece) are kept
+        in move_history instead and never go on this stack.
+        """
+        from_sq = square_index(*from_pos)
+        to_sq = square_index(*to_pos)
+        moved_piece = self._grid[from_pos[0]][from_pos[1]]
+        captured_piece = self._grid[to_pos[0]][to_pos[1]]
+        
+        self._undo_stack.append((from_sq, to_sq, moved_piece, captured_piece,
+                                 self.last_moved_piece, self.game_over, self.winner,
+                                 self._terminal_cache))
+        self._apply_move(from_sq, to_sq, moved_piece, captured_piece, to_pos)
+    
+    def _apply_move(self, from_sq, to_sq, moved_piece, captured_piece, to_pos):
+        """Move the pieces and pass the turn, saving nothing"""
+        if captured_piece:
+            self._remove(to_sq, captured_piece)
+        if moved_piece:
+            self._remove(from_sq, moved_piece)
+            self._place(to_sq, moved_piece)
+        
+        self.last_moved_piece = to_pos
+        self.current_turn = 'black' if self.current_turn == 'white' else 'white'
+    
+    def make_null_move(self):
+        """Pass the turn without moving; undone with unmake_move like any move"""
+        self._undo_stack.append((None, None, None, None,
+                                 self.last_moved_piece, self.game_over, self.winner,
+                                 self._terminal_cache))
+        self.last_moved_piece = None
+        self.current_turn = 'black' if self.current_turn == 'white' else 'white'
+    
+    def unmake_move(self):
+        """Take back the last move played with make_move"""
+        (from_sq, to_sq, moved_piece, captured_piece,
+         self.last_moved_piece, self.game_over, self.winner,
+         self._terminal_cache) = self._undo_stack.pop()
+        
+        if moved_piece:
+            self._remove(to_sq, moved_piece)
+            self._place(from_sq, moved_piece)
+        if captured_piece:
+            self._place(to_sq, captured_piece)
+        
+        self.current_turn = 'black' if self.current_turn == 'white' else 'white'
+    
+    @property
+    def stack_size(self):
+        """Number of moves that unmake_move can currently take back"""
+        return len(self._undo_stack)
+    
+    def unmake_to(self, stack_size):
+        """Unmake moves until only stack_size remain on the undo stack"""
+        while len(self._undo_stack) > stack_size:
+            self.unmake_move()
+    
+    def get_valid_moves(self, row, col):
+        """Get valid moves for the piece at (row, col)"""
+        piece = self._grid[row][col]
+        if not piece:
+            return []
+        
+        color, piece_type = piece
+        possible_moves = self._get_possible_moves(row, col, color, piece_type)
+        
+        legal_moves = []
+        for move in possible_moves:
+            if not self._would_be_in_check(color, (row, col), move):
+                legal_moves.append(move)
+                
+        return legal_moves
+    
+    def get_all_valid_moves(self, color):
+        """Get every legal (from, to) move for the specified color"""
+        moves = []
+        for square, piece_type in list(self.piece_squares[color].items()):
+            from_pos = SQUARE_POSITIONS[square]
+            for target in iter_squares(self._get_move_targets(square, color, piece_type)):
+                to_pos = SQUARE_POSITIONS[target]
+                if not self._would_be_in_check(color, from_pos, to_pos):
+                    moves.append((from_pos, to_pos))
+        return moves
+    
+    def _get_possible_moves(self, row, col, color, piece_type):
+        """Get all possible moves without considering check"""
+        targets = self._get_move_targets(square_index(row, col), color, piece_type)
+        return [SQUARE_POSITIONS[sq] for sq in iter_squares(targets)]
+    
+    def _get_move_targets(self, square, color, piece_type):
+        """Bitboard of squares the piece on square can move to, ignoring check"""
+        own = self.occupancy[color]
+        enemy = self.occupancy['black' if color == 'white' else 'white']
+        occupied = own | enemy
+        
+        if piece_type == 'pawn':
+            return ((PAWN_PUSHES[color][square] & ~occupied) |
+                    (piece_attacks(square, color, piece_type, occupied) & enemy))
+        
+        return piece_attacks(square, color, piece_type, occupied) & ~own
+    
+    def _find_king(self, color):
+        """Find the position of the king of the specified color"""
+        king_square = self.king_squares[color]
+        if king_square is None:
+            return None
+        return SQUARE_POSITIONS[king_square]
+    
+    def is_in_check(self, color):
+        """Determine if the specified color's king is in check."""
+        king_square = self.king_squares[color]
+        if king_square is None:
+            return False  
+
+        opponent_color = 'black' if color == 'white' else 'white'
+        return self._is_attacked(king_square, opponent_color)
+    
+    def is_square_attacked(self, square, by_color):
+        """Determine if any piece of by_color attacks the (row, col) square."""
+        return self._is_attacked(square_index(*square), by_color)
+    
+    def _is_attacked(self, square, by_color):
+        """Look outward from square for an attacker, stopping at the first hit"""
+        bitboards = self.bitboards
+        target_color = 'black' if by_color == 'white' else 'white'
+        if PAWN_ATTACKS[target_color][square] & bitboards[(by_color, 'pawn')]:
+            return True
+        if KNIGHT_ATTACKS[square] & bitboards[(by_color, 'knight')]:
+            return True
+        if KING_ATTACKS[square] & bitboards[(by_color, 'king')]:
+            return True
+        
+        occupied = self.occupancy['white'] | self.occupancy['black']
+        queens = bitboards[(by_color, 'queen')]
+        for sliders, directions in ((bitboards[(by_color, 'rook')] | queens, ORTHOGONAL_DIRECTIONS),
+                                    (bitboards[(by_color, 'bishop')] | queens, DIAGONAL_DIRECTIONS)):
+            if not sliders:
+                continue
+            for direction in directions:
+                blockers = RAYS[direction][square] & occupied
+                if not blockers:
+                    continue
+                if RAY_IS_ASCENDING[direction]:
+                    first_blocker = blockers & -blockers
+                else:
+                    first_blocker = 1 << (blockers.bit_length() - 1)
+                if first_blocker & sliders:
+                    return True
+        return False
+    
+    def attackers_to(self, square, occupied):
+        """Bitboard of the pieces of either color attacking square.
+        
+        Sliders are traced through the occupied bitboard rather than the
+        board itself, so squares cleared from it uncover pieces behind them.
+        """
+        bitboards = self.bitboards
+        attackers = ((PAWN_ATTACKS['black'][square] & bitboards[('white', 'pawn')]) |
+                     (PAWN_ATTACKS['white'][square] & bitboards[('black', 'pawn')]) |
+                     (KNIGHT_ATTACKS[square] & (bitboards[('white', 'knight')] |
+                                                bitboards[('black', 'knight')])) |
+                     (KING_ATTACKS[square] & (bitboards[('white', 'king')] |
+                                              bitboards[('black', 'king')])))
+        queens = bitboards[('white', 'queen')] | bitboards[('black', 'queen')]
+        rooks = bitboards[('white', 'rook')] | bitboards[('black', 'rook')] | queens
+        bishops = bitboards[('white', 'bishop')] | bitboards[('black', 'bishop')] | queens
+        if rooks:
+            attackers |= rook_attacks(square, occupied) & rooks
+        if bishops:
+            attackers |= bishop_attacks(square, occupied) & bishops
+        return attackers & occupied
+    
+    def _would_be_in_check(self, color, from_pos, to_pos):
+        """Check if making a move would result in check."""
+
+        from_sq = square_index(*from_pos)
+        to_sq = square_index(*to_pos)
+        moved_piece = self._grid[from_pos[0]][from_pos[1]]
+        captured_piece = self._grid[to_pos[0]][to_pos[1]]
+        
+        if captured_piece:
+            self._remove(to_sq, captured_piece)
+        self._remove(from_sq, moved_piece)
+        self._place(to_sq, moved_piece)
+        in_check = self.is_in_check(color)
+        
+        self._remove(to_sq, moved_piece)
+        self._place(from_sq, moved_piece)
+        if captured_piece:
+            self._place(to_sq, captured_piece)
+        
+        return in_check
+    
+    def has_legal_moves(self, color):
+        """Check if the specified color has any legal moves"""
+        for square, piece_type in list(self.piece_squares[color].items()):
+            row, col = SQUARE_POSITIONS[square]
+            for move in self._get_possible_moves(row, col, color, piece_type):
+                if not self._would_be_in_check(color, (row, col), move):
+                    return True
+        return False
+    
+    def get_terminal_status(self):
+        """Return 'checkmate', 'stalemate' or None for the side to move.
+        
+        The result is cached against the position key, so it is worked out
+        at most once per position however many callers ask.
+        """
+        key = self.zobrist_key
+        cached_key, status = self._terminal_cache
+        if cached_key == key:
+            return status
+        
+        status = None
+        if not self.has_legal_moves(self.current_turn):
+            status = 'checkmate' if self.is_in_check(self.current_turn) else 'stalemate'
+        self._terminal_cache = (key, status)
+        return status
+    
+    def is_checkmate(self, color):
+        """Determine if the specified color is in checkmate."""
+        if color == self.current_turn:
+            return self.get_terminal_status() == 'checkmate'
+        if not self.is_in_check(color):
+            return False
+            
+        return not self.has_legal_moves(color)
+    
+    def is_stalemate(self, color):
+        """Determine if the specified color is in stalemate."""
+        if color == self.current_turn:
+            return self.get_terminal_status() == 'stalemate'
+        if self.is_in_check(color):
+            return False
+            
+        return not self.has_legal_moves(color)
+    
+    def check_game_end_conditions(self):
+        """Check if the game has ended (checkmate or stalemate)"""
+        current_player = self.current_turn
+        status = self.get_terminal_status()
+        
+        if status == 'checkmate':
+            self.game_over = True
+            self.winner = 'black' if current_player == 'white' else 'white'
+            return True
+            
+        if status == 'stalemate':
+            self.game_over = True
+            self.winner = 'draw'
+            return True
+            
+        return False
+    
+    def get_game_status(self):
+        """Get the current state of the game."""
+        if self.is_checkmate(self.current_turn):
+            opponent = 'black' if self.current_turn == 'white' else 'white'
+            self.game_over = True
+            self.winner = opponent
+            return f"Game Over - {opponent.capitalize()} wins by checkmate"
+            
+        if self.is_stalemate(self.current_turn):
+            self.game_over = True
+            self.winner = 'draw'
+            return "Game Over - Draw by stalemate"
+            
+        if self.game_over:
+            if self.winner == 'draw':
+                return "Game Over - Draw by stalemate"
+            else:
+                return f"Game Over - {self.winner.capitalize()} wins by checkmate"
+        
+        if self.is_in_check(self.current_turn):
+            return f"{self.current_turn.capitalize()} is in check"
+            
+        return f"{self.current_turn.capitalize()}'s turn"
+        
+    def render(self):
+        """The board and game status as text, as display prints them"""
+        lines = ['', '  a b c d e', '  ---------']
+        for row in range(ROWS):
+            row_str = f"{ROWS-row}|"
+            for col in range(COLS):
+                piece = self.board[row][col]
+                if piece is None:
+                    row_str += ' .'
+                else:
+                    color, piece_type = piece
+                    symbol = PIECE_SYMBOLS[piece_type]
+                    if color == 'black':
+                        symbol = symbol.lower()
+                    row_str += f' {symbol}'
+            lines.append(row_str)
+        lines += ['', self.get_game_status()]
+        return '\n'.join(lines)
+    
+    def display(self):
+        """Display the current state of the board."""
+        print(self.render())
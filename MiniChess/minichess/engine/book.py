@@ -0,0 +1,80 @@
+import mmap
+import os
+import struct
+from .bitboard import SQUARE_POSITIONS, square_index
+
+# File layout: a header (magic, version, entry count) followed by entries
+# sorted by position key, each a 64-bit Zobrist key and the from/to square
+# indexes of the book move.
+BOOK_MAGIC = b'MCBK'
+BOOK_VERSION = 1
+HEADER = struct.Struct('<4sII')
+ENTRY = struct.Struct('<QBB')
+
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(__file__), 'data', 'opening.book')
+
+
+def write_book(entries, path):
+    """Write {zobrist_key: (from_pos, to_pos)} as a sorted book file"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as output:
+        output.write(HEADER.pack(BOOK_MAGIC, BOOK_VERSION, len(entries)))
+        for key in sorted(entries):
+            from_pos, to_pos = entries[key]
+            output.write(ENTRY.pack(key, square_index(*from_pos), square_index(*to_pos)))
+
+
+class OpeningBook:
+    """Read-only opening book probed through mmap.
+    
+    Lookups binary-search the mapped file, so only the pages touched are
+    read in and every process using the same file shares them.
+    """
+    def __init__(self, path=DEFAULT_BOOK_PATH):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size = HEADER.unpack_from(self._map, 0)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            self.close()
+            raise ValueError(f"Not a version {BOOK_VERSION} opening book: {path}")
+    
+    def __len__(self):
+        return self.size
+    
+    def _entry(self, index):
+        return ENTRY.unpack_from(self._map, HEADER.size + index * ENTRY.size)
+    
+    def probe(self, board):
+        """Book move for board's position as (from_pos, to_pos), or None"""
+        key = board.zobrist_key
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            entry_key, from_sq, to_sq = self._entry(middle)
+            if entry_key < key:
+                low = middle + 1
+            elif entry_key > key:
+                high = middle
+            else:
+                return (SQUARE_POSITIONS[from_sq], SQUARE_POSITIONS[to_sq])
+        return None
+    
+    def close(self):
+        self._map.close()
+        self._file.close()
+    
+    def __getstate__(self):
+        return {'path': self.path}
+    
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+
+def open_default_book():
+    """The bundled opening book, or None if it has not been built"""
+    if not os.path.exists(DEFAULT_BOOK_PATH):
+        return None
+    return OpeningBook(DEFAULT_BOOK_PATH)
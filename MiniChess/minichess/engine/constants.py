@@ -0,0 +1 @@
+COLS, ROWS = 5, 6
@@ -0,0 +1,45 @@
+from .constants import COLS, ROWS
+from .bitboard import COLORS, PIECE_TYPES, NUM_SQUARES, square_position
+
+PIECE_VALUES = {
+    'pawn': 100,
+    'knight': 320,
+    'bishop': 330,
+    'rook': 500,
+    'queen': 900,
+    'king': 20000
+}
+
+CENTER_BONUS = 50
+KING_BACK_RANK_BONUS = 20
+CENTER_SQUARES = {(2, 2), (2, 3), (3, 2), (3, 3)}
+
+# Piece-square tables from white's point of view (row 5 is white's back
+# rank); black reads them with the rows mirrored.
+PIECE_SQUARE_TABLES = {}
+for _piece_type in PIECE_TYPES:
+    _table = [[CENTER_BONUS if (row, col) in CENTER_SQUARES else 0 for col in range(COLS)]
+              for row in range(ROWS)]
+    if _piece_type == 'king':
+        _table[ROWS - 1] = [bonus + KING_BACK_RANK_BONUS for bonus in _table[ROWS - 1]]
+    PIECE_SQUARE_TABLES[_piece_type] = _table
+
+
+def _build_square_scores():
+    scores = {}
+    for color in COLORS:
+        for piece_type in PIECE_TYPES:
+            table = PIECE_SQUARE_TABLES[piece_type]
+            values = []
+            for square in range(NUM_SQUARES):
+                row, col = square_position(square)
+                if color == 'black':
+                    row = ROWS - 1 - row
+                values.append(PIECE_VALUES[piece_type] + table[row][col])
+            scores[(color, piece_type)] = values
+    return scores
+
+
+# Material plus piece-square bonus for every (color, piece_type) on every
+# square, so ChessBoard can keep each side's total up to date move by move.
+PIECE_SQUARE_SCORES = _build_square_scores()
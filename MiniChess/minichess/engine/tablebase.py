@@ -0,0 +1,269 @@
+import functools
+import glob
+import mmap
+import os
+import struct
+from .constants import COLS, ROWS
+from .bitboard import NUM_SQUARES
+
+# One file per material signature such as 'KQvK': a header (magic, version,
+# piece count) followed by one byte per index, or by nothing at all when
+# every position of the signature is a draw. The index packs the side to
+# move, the pair of king squares and the square of every other piece in
+# signature order:
+#     index = ((stm * len(KING_PAIRS) + pair) * n_0 + sq_0) * n_1 + sq_1 ...
+# Positions are first mirrored left-right so the white king stands on
+# files a-c; KING_PAIRS only holds those king squares that are not
+# touching, and pawns only count the 25 squares off their own back rank.
+# Byte values: 0 draw (or unreachable), 1-127 win with mate in 2b-1 plies,
+# 128-255 loss with mate in 2(b-128) plies.
+TABLE_MAGIC = b'MCTB'
+TABLE_VERSION = 2
+HEADER = struct.Struct('<4sII')
+TABLE_SUFFIX = '.mctb'
+MAX_DTM = 253
+
+WIN, DRAW, LOSS = 1, 0, -1
+
+# Signature letters, strongest first; the stronger side is always stored
+# as white.
+SIGNATURE_ORDER = ('king', 'queen', 'rook', 'bishop', 'knight', 'pawn')
+SIGNATURE_LETTERS = {'king': 'K', 'queen': 'Q', 'rook': 'R',
+                     'bishop': 'B', 'knight': 'N', 'pawn': 'P'}
+LETTER_PIECES = {letter: piece_type for piece_type, letter in SIGNATURE_LETTERS.items()}
+
+DEFAULT_TABLEBASE_DIR = os.path.join(os.path.dirname(__file__), 'data', 'tablebases')
+
+
+def encode_result(outcome, dtm):
+    """Table byte for a WIN or LOSS at dtm plies, or a DRAW"""
+    if outcome == WIN:
+        return (dtm + 1) // 2
+    if outcome == LOSS:
+        return 128 + dtm // 2
+    return 0
+
+
+def decode_result(value):
+    """(outcome, dtm) for a table byte; draws have dtm None"""
+    if value == 0:
+        return DRAW, None
+    if value < 128:
+        return WIN, 2 * value - 1
+    return LOSS, 2 * (value - 128)
+
+
+def mirror_square(square):
+    """The square reflected across the middle of the board (rank 1 <-> rank 6)"""
+    row, col = divmod(square, COLS)
+    return (ROWS - 1 - row) * COLS + col
+
+
+def mirror_file(square):
+    """The square reflected across the middle file (a <-> e)"""
+    row, col = divmod(square, COLS)
+    return row * COLS + COLS - 1 - col
+
+
+def _kings_apart(white_king, black_king):
+    white_row, white_col = divmod(white_king, COLS)
+    black_row, black_col = divmod(black_king, COLS)
+    return max(abs(white_row - black_row), abs(white_col - black_col)) > 1
+
+
+# (white king, black king) squares a table has entries for
+KING_PAIRS = [(white_king, black_king)
+              for white_king in range(NUM_SQUARES) if white_king % COLS <= (COLS - 1) // 2
+              for black_king in range(NUM_SQUARES) if _kings_apart(white_king, black_king)]
+KING_PAIR_INDEX = {pair: index for index, pair in enumerate(KING_PAIRS)}
+
+
+def _side_strength(piece_types):
+    return (len(piece_types), sorted(-SIGNATURE_ORDER.index(t) for t in piece_types))
+
+
+def _side_letters(piece_types):
+    return ''.join(SIGNATURE_LETTERS[t] for t in sorted(piece_types, key=SIGNATURE_ORDER.index))
+
+
+def signature_pieces(signature):
+    """[(color, piece_type), ...] in index order for a signature like 'KRvKN'"""
+    white, black = signature.split('v')
+    return ([('white', LETTER_PIECES[letter]) for letter in white] +
+            [('black', LETTER_PIECES[letter]) for letter in black])
+
+
+@functools.lru_cache(maxsize=None)
+def table_layout(signature):
+    """(white king slot, black king slot, [(slot, first square, squares), ...]
+    for the other pieces) of signature's index"""
+    pieces = signature_pieces(signature)
+    others = []
+    for slot, (color, piece_type) in enumerate(pieces):
+        if piece_type == 'king':
+            continue
+        if piece_type == 'pawn':
+            # Pawns never stand on their own back rank
+            others.append((slot, 0 if color == 'white' else COLS, NUM_SQUARES - COLS))
+        else:
+            others.append((slot, 0, NUM_SQUARES))
+    return pieces.index(('white', 'king')), pieces.index(('black', 'king')), others
+
+
+def table_size(signature):
+    """Number of entries in signature's table"""
+    size = 2 * len(KING_PAIRS)
+    for _, _, squares in table_layout(signature)[2]:
+        size *= squares
+    return size
+
+
+def table_index(signature, stm, squares):
+    """Index of the position with side to move stm (0 for white) and the
+    pieces of signature on squares, or None if the table has no entry"""
+    white_king, black_king, others = table_layout(signature)
+    if squares[white_king] % COLS > (COLS - 1) // 2:
+        squares = [mirror_file(square) for square in squares]
+    pair = KING_PAIR_INDEX.get((squares[white_king], squares[black_king]))
+    if pair is None:
+        return None
+    index = stm * len(KING_PAIRS) + pair
+    for slot, first, count in others:
+        square = squares[slot] - first
+        if not 0 <= square < count:
+            return None
+        index = index * count + square
+    return index
+
+
+def canonical_signature(white, black):
+    """(signature, flipped) for the given piece types of each side.
+
+    flipped is True when black holds the stronger side, in which case the
+    position is looked up with the board mirrored and the colours swapped.
+    """
+    flipped = _side_strength(black) > _side_strength(white)
+    if flipped:
+        white, black = black, white
+    return _side_letters(white) + 'v' + _side_letters(black), flipped
+
+
+def material_signature(board):
+    """(signature, flipped) for board's material"""
+    return canonical_signature(list(board.piece_squares['white'].values()),
+                               list(board.piece_squares['black'].values()))
+
+
+def position_squares(board, signature, flipped):
+    """(stm, squares) of board as stored in signature's table: stm is 0 when
+    the stored white side is to move, squares follow signature order"""
+    stored_colors = ('black', 'white') if flipped else ('white', 'black')
+    stm = int((board.current_turn == 'white') == flipped)
+    result = []
+    for stored_color, letters in zip(stored_colors, signature.split('v')):
+        squares = {}
+        for square, piece_type in board.piece_squares[stored_color].items():
+            if flipped:
+                square = mirror_square(square)
+            squares.setdefault(piece_type, []).append(square)
+        for letter in letters:
+            result.append(squares[LETTER_PIECES[letter]].pop())
+    return stm, result
+
+
+def position_index(board, signature, flipped):
+    """Table index of board's position within signature's table, or None"""
+    stm, squares = position_squares(board, signature, flipped)
+    return table_index(signature, stm, squares)
+
+
+def write_table(path, signature, values):
+    """Write a solved table (a bytearray of encoded results) to path; a table
+    of draws only is written as a bare header"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    piece_count = len(signature) - 1
+    if len(values) != table_size(signature):
+        raise ValueError(f"{signature} needs {table_size(signature)} entries, got {len(values)}")
+    with open(path, 'wb') as output:
+        output.write(HEADER.pack(TABLE_MAGIC, TABLE_VERSION, piece_count))
+        if any(values):
+            output.write(values)
+
+
+class Tablebases:
+    """Read-only endgame tables probed through mmap.
+
+    Every table file in directory is mapped when the set is opened; a probe
+    works out the position's signature and index and reads a single byte.
+    Signatures without a table are not covered, while a table file with no
+    entries marks one where every position is drawn.
+    """
+    def __init__(self, directory=DEFAULT_TABLEBASE_DIR):
+        self.directory = directory
+        self._files = {}
+        self._maps = {}
+        self.max_pieces = 0
+        for path in sorted(glob.glob(os.path.join(directory, '*' + TABLE_SUFFIX))):
+            signature = os.path.basename(path)[:-len(TABLE_SUFFIX)]
+            table_file = open(path, 'rb')
+            table_map = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, piece_count = HEADER.unpack_from(table_map, 0)
+            if (magic != TABLE_MAGIC or version != TABLE_VERSION or piece_count != len(signature) - 1
+                    or len(table_map) not in (HEADER.size, HEADER.size + table_size(signature))):
+                table_map.close()
+                table_file.close()
+                self.close()
+                raise ValueError(f"Not a version {TABLE_VERSION} tablebase file: {path}")
+            self._files[signature] = table_file
+            self._maps[signature] = table_map
+            self.max_pieces = max(self.max_pieces, piece_count)
+
+    def __len__(self):
+        return len(self._maps)
+
+    @property
+    def signatures(self):
+        return sorted(self._maps)
+
+    def probe(self, board):
+        """(outcome, dtm) for the side to move, or None if no table covers it"""
+        if len(board.piece_squares['white']) + len(board.piece_squares['black']) > self.max_pieces:
+            return None
+        signature, flipped = material_signature(board)
+        table_map = self._maps.get(signature)
+        if table_map is None:
+            return None
+        if len(table_map) == HEADER.size:
+            return DRAW, None
+        index = position_index(board, signature, flipped)
+        if index is None:
+            return None
+        return decode_result(table_map[HEADER.size + index])
+
+    def close(self):
+        for table_map in self._maps.values():
+            table_map.close()
+        for table_file in self._files.values():
+            table_file.close()
+        self._maps = {}
+        self._files = {}
+
+    def __getstate__(self):
+        return {'directory': self.directory}
+
+    def __setstate__(self, state):
+        self.__init__(state['directory'])
+
+
+def open_default_tablebases():
+    """The tables in DEFAULT_TABLEBASE_DIR, or None if there are none.
+
+    Only some are shipped; python -m minichess.build_tablebases --pieces 4
+    fills in the rest of the 4-piece signatures.
+    """
+    tablebases = Tablebases(DEFAULT_TABLEBASE_DIR)
+    if not len(tablebases):
+        return None
+    return tablebases
@@ -0,0 +1,86 @@
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+# Rough size of one stored entry: a 6-tuple plus its 64-bit key and move.
+ENTRY_BYTES = 208
+
+
+class TranspositionTable:
+    """Fixed-size hash table of search results keyed by Zobrist key.
+    
+    Each bucket has a depth-preferred slot, which is only replaced by an
+    equal or deeper search of any position or by anything once its entry
+    is from an earlier search, and an always-replace slot that takes
+    everything else. Entries are (key, depth, flag, score, best_move,
+    generation), where generation counts new_search calls.
+    """
+    def __init__(self, max_memory_mb=16):
+        buckets = 1
+        while buckets * 4 * ENTRY_BYTES <= max_memory_mb * 1024 * 1024:
+            buckets *= 2
+        self.size = buckets
+        self.mask = buckets - 1
+        self.clear()
+    
+    def new_search(self):
+        """Start a new search; entries stored before now become replaceable"""
+        self.generation += 1
+    
+    def clear(self):
+        """Drop every entry and reset the statistics"""
+        self.depth_slots = [None] * self.size
+        self.recent_slots = [None] * self.size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.collisions = 0
+        self.stores = 0
+        self.overwrites = 0
+    
+    def probe(self, key):
+        """Return the entry stored for key, or None"""
+        self.probes += 1
+        index = key & self.mask
+        entry = self.depth_slots[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        other = self.recent_slots[index]
+        if other is not None and other[0] == key:
+            self.hits += 1
+            return other
+        if entry is not None or other is not None:
+            self.collisions += 1
+        return None
+    
+    def store(self, key, depth, flag, score, best_move):
+        """Save a search result, evicting according to the bucket policy"""
+        self.stores += 1
+        index = key & self.mask
+        new_entry = (key, depth, flag, score, best_move, self.generation)
+        entry = self.depth_slots[index]
+        if (entry is None or entry[0] == key or depth >= entry[1]
+                or entry[5] != self.generation):
+            if entry is not None and entry[0] != key:
+                self.overwrites += 1
+                self.recent_slots[index] = entry
+            self.depth_slots[index] = new_entry
+            return
+        other = self.recent_slots[index]
+        if other is not None and other[0] != key:
+            self.overwrites += 1
+        self.recent_slots[index] = new_entry
+    
+    def stats(self):
+        """Usage counters for reporting"""
+        filled = sum(1 for entry in self.depth_slots if entry is not None)
+        filled += sum(1 for entry in self.recent_slots if entry is not None)
+        return {
+            'entries': filled,
+            'capacity': 2 * self.size,
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.probes if self.probes else 0.0,
+            'collisions': self.collisions,
+            'stores': self.stores,
+            'overwrites': self.overwrites,
+        }
@@ -0,0 +1,9 @@
+import random
+from .bitboard import COLORS, PIECE_TYPES, NUM_SQUARES
+
+# Fixed seed so position keys are reproducible between runs and processes.
+_rng = random.Random(0x5C4E55)
+
+PIECE_SQUARE_KEYS = {(color, piece_type): [_rng.getrandbits(64) for _ in range(NUM_SQUARES)]
+                     for color in COLORS for piece_type in PIECE_TYPES}
+BLACK_TO_MOVE_KEY = _rng.getrandbits(64)
@@ -0,0 +1,7 @@
+def run():
+    """Initialise pygame and run the game window"""
+    import pygame
+    pygame.init()
+    from .game import MiniChess5x6
+    game = MiniChess5x6()
+    game.run()
@@ -1,4 +1,5 @@
-COLS, ROWS = 5, 6
+from ..engine.constants import COLS, ROWS
+
 WIDTH, HEIGHT = 640, 740
 BOARD_WIDTH = 500
 BOARD_HEIGHT = 600
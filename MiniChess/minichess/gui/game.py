@@ -2,11 +2,12 @@ import pygame
 import sys
 import time
 from pygame.locals import *
-from constants import *
-from board import ChessBoard
-from ui import UI
-from game_setup import GameSetupMenu
-from ai import MiniChessAI
+from .constants import *
+from ..engine.board import ChessBoard, move_to_text
+from ..engine.ai import MATE_SCORE, MATE_THRESHOLD
+from ..engine.ai_worker import AIWorker
+from .ui import UI
+from .game_setup import GameSetupMenu
 
 class MiniChess5x6:
     def __init__(self):
@@ -25,13 +26,15 @@ class MiniChess5x6:
         self.ui = UI(self.screen)
         self.setup_menu = GameSetupMenu(self.screen)
         
-        self.board_history = [self.chess_board.copy_board()]
-        self.history_index = 0
-        
         self.clock = pygame.time.Clock()
         
         self.ai_think_time = 1.0  
         self.ai_last_move_time = 0
+        self.ai_worker = AIWorker()
+        self.ai_ponder = True
+        self.ai_searching = False
+        self.pending_ai_move = None
+        self.ai_info_text = None
     
     def handle_click(self, pos):
         """Handle mouse clicks on the game board"""
@@ -64,13 +67,8 @@ class MiniChess5x6:
                 self.valid_moves = []
             
             elif (row, col) in self.valid_moves:
-                self.board_history = self.board_history[:self.history_index+1]
-                
                 self.chess_board.move_piece(self.selected_square, (row, col))
                 
-                self.board_history.append(self.chess_board.copy_board())
-                self.history_index += 1
-                
                 self.selected_square = None
                 self.valid_moves = []
                 
@@ -90,47 +88,75 @@ class MiniChess5x6:
                     self.selected_square = None
                     self.valid_moves = []
 
-    def make_ai_move(self):
-        ai = MiniChessAI(depth=3)
-        move = ai.get_best_move(self.chess_board, self.chess_board.current_turn)
-        
+    def start_ai_search(self):
+        """Start searching for the side to move on the background worker"""
+        self.ai_worker.start_search(self.chess_board, self.chess_board.current_turn, depth=3)
+        self.ai_searching = True
+        self.pending_ai_move = None
+        self.ai_info_text = None
+    
+    def cancel_ai_search(self):
+        """Stop any running search and drop its result"""
+        self.ai_worker.cancel()
+        self.ai_searching = False
+        self.pending_ai_move = None
+    
+    def poll_ai_search(self):
+        """Collect the worker's progress and, once it has finished, its result"""
+        for kind, data in self.ai_worker.poll():
+            if kind == 'info':
+                self.ai_info_text = self.format_ai_info(data)
+            elif kind == 'bestmove':
+                self.ai_searching = False
+                self.pending_ai_move = data
+    
+    def format_ai_info(self, info):
+        """One line for the latest search iteration, e.g.
+        'White AI  depth 4  +0.35  d2d3 d5d4'"""
+        score = info['score']
+        if abs(score) >= MATE_THRESHOLD:
+            moves = (MATE_SCORE - abs(score) + 1) // 2
+            score_text = f"mate {moves if score > 0 else -moves}"
+        else:
+            score_text = f"{score / 100:+.2f}"
+        pv_text = ' '.join(move_to_text(move) for move in info['pv'][:5])
+        return (f"{self.chess_board.current_turn.capitalize()} AI  depth {info['depth']}"
+                f"  {score_text}  {pv_text}")
+    
+    def make_ai_move(self, move):
         if move:
             from_sq, to_sq = move
-            self.board_history = self.board_history[:self.history_index+1]
-            if self.chess_board.move_piece(from_sq, to_sq):
-                self.board_history.append(self.chess_board.copy_board())
-                self.history_index += 1
-                return True
+            return self.chess_board.move_piece(from_sq, to_sq)
         return False
     
     def undo_move(self):
         """Undo the last move"""
-        if self.history_index > 0:
-            self.history_index -= 1
-            self.chess_board.board = [row.copy() for row in self.board_history[self.history_index]]
-            self.chess_board.current_turn = 'black' if self.chess_board.current_turn == 'white' else 'white'
-            self.chess_board.game_over = False
-            self.chess_board.winner = None
-            self.selected_square = None
-            self.valid_moves = []
+        self.go_to_ply(self.chess_board.ply - 1)
     
     def redo_move(self):
         """Redo the last undone move"""
-        if self.history_index < len(self.board_history) - 1:
-            self.history_index += 1
-            self.chess_board.board = [row.copy() for row in self.board_history[self.history_index]]
-            self.chess_board.current_turn = 'black' if self.chess_board.current_turn == 'white' else 'white'
-            
-            self.chess_board.check_game_end_conditions()
-            
-            self.selected_square = None
-            self.valid_moves = []
+        self.go_to_ply(self.chess_board.ply + 1)
+    
+    def go_to_ply(self, ply):
+        """Step the game back or forward to the position after ply moves;
+        out-of-range plies are ignored and leave any search running"""
+        if not 0 <= ply <= self.chess_board.last_ply:
+            return
+        self.ai_worker.takeback()
+        self.ai_searching = False
+        self.pending_ai_move = None
+        self.ai_info_text = None
+        self.chess_board.go_to_ply(ply)
+        self.selected_square = None
+        self.valid_moves = []
     
     def reset_game(self):
         """Reset the game state but keep settings"""
+        self.ai_worker.new_game()
+        self.ai_searching = False
+        self.pending_ai_move = None
+        self.ai_info_text = None
         self.chess_board = ChessBoard()
-        self.board_history = [self.chess_board.copy_board()]
-        self.history_index = 0
         self.selected_square = None
         self.valid_moves = []
         
@@ -150,6 +176,17 @@ class MiniChess5x6:
                 if event.type == QUIT:
                     running = False
                 
+                elif event.type == KEYDOWN and self.state == GAME:
+                    # Arrow keys step through the game, Home/End jump to its ends
+                    if event.key == K_LEFT:
+                        self.undo_move()
+                    elif event.key == K_RIGHT:
+                        self.redo_move()
+                    elif event.key == K_HOME:
+                        self.go_to_ply(0)
+                    elif event.key == K_END:
+                        self.go_to_ply(self.chess_board.last_ply)
+                
                 elif event.type == MOUSEBUTTONDOWN and event.button == 1:  # Left click
                     pos = pygame.mouse.get_pos()
                     
@@ -200,9 +237,19 @@ class MiniChess5x6:
             
             if self.state == GAME and not self.chess_board.game_over:
                 current_player_type = self.white_player if self.chess_board.current_turn == "white" else self.black_player
-                if current_player_type == "ai" and current_time - self.ai_last_move_time >= self.ai_think_time:
-                    self.make_ai_move()
-                    self.ai_last_move_time = current_time
+                if current_player_type == "ai":
+                    if not self.ai_searching and self.pending_ai_move is None:
+                        self.start_ai_search()
+                    self.poll_ai_search()
+                    if (self.pending_ai_move is not None and
+                            current_time - self.ai_last_move_time >= self.ai_think_time):
+                        move, self.pending_ai_move = self.pending_ai_move, None
+                        ai_color = self.chess_board.current_turn
+                        self.make_ai_move(move)
+                        self.ai_last_move_time = current_time
+                        next_player_type = self.white_player if self.chess_board.current_turn == "white" else self.black_player
+                        if self.ai_ponder and next_player_type == "human" and not self.chess_board.game_over:
+                            self.ai_worker.start_ponder(self.chess_board, ai_color, depth=3)
             
             
             if self.state == MAIN_MENU:
@@ -219,10 +266,12 @@ class MiniChess5x6:
                     self.selected_square,
                     self.valid_moves,
                     self.chess_board.game_over,
-                    self.chess_board.winner
+                    self.chess_board.winner,
+                    self.ai_info_text
                 )
             
             self.clock.tick(60)
         
+        self.cancel_ai_search()
         pygame.quit()
         sys.exit()
\ No newline at end of file
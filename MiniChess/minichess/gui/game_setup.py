@@ -1,6 +1,6 @@
 import pygame
 from pygame.locals import *
-from constants import *
+from .constants import *
 
 class GameSetupMenu:
     def __init__(self, screen):
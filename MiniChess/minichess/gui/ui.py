@@ -1,6 +1,6 @@
 import pygame
 from pygame.locals import *
-from constants import *
+from .constants import *
 
 class UI:
     def __init__(self, screen):
@@ -88,8 +88,9 @@ class UI:
         
         pygame.display.flip()
     
-    def draw_game(self, board, current_theme, current_player, selected_square, valid_moves, game_over=False, winner=None):
-        """Draw the game board and interface"""
+    def draw_game(self, board, current_theme, current_player, selected_square, valid_moves, game_over=False,
+                  winner=None, ai_info=None):
+        """Draw the game board and interface; ai_info is the AI's latest search line"""
         theme = THEMES[current_theme]
         self.screen.fill(BACKGROUND_COLOR)
         
@@ -129,6 +130,10 @@ class UI:
             self.screen.blit(text, (MARGIN_X - 25, MARGIN_Y + i*SQUARE_SIZE + SQUARE_SIZE//2 - 10))
         
 
+        if ai_info:
+            info_text = self.THEME_FONT.render(ai_info, True, COORDINATES_COLOR)
+            self.screen.blit(info_text, (MARGIN_X, (MARGIN_Y - info_text.get_height()) // 2))
+
         status_bar = pygame.Rect(0, HEIGHT - 40, WIDTH, 40)
         pygame.draw.rect(self.screen, STATUS_BAR_COLOR, status_bar)
         
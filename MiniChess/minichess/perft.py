@@ -0,0 +1,174 @@
+"""Perft: count the positions the move generator reaches to a fixed depth.
+
+    python -m minichess.perft --depth 4
+    python -m minichess.perft --depth 3 --fen "k4/p1r2/5/2N2/1P3/4K w" --divide
+    python -m minichess.perft --check
+    python -m minichess.perft --selftest --games 200
+
+--check compares the generator against PERFT_REFERENCE, which was produced
+by the original grid-walking move generator. --selftest plays random games
+and checks that make/unmake and undo/redo (go_to_ply) bring back every
+earlier position exactly, and that the incrementally kept piece lists,
+scores and Zobrist key always match a board rebuilt from the grid.
+"""
+import argparse
+import random
+import sys
+import time
+from .engine.board import ChessBoard, START_FEN, move_to_text
+
+# Leaf counts at depth 1, 2, ... for each reference position.
+PERFT_REFERENCE = {
+    START_FEN: [7, 49, 451, 4178, 45840, 503344],
+    'r1bqk/p2pp/npp2/2NP1/PP2P/R1BQK w': [18, 212, 3772, 49377, 856864],
+    'rn1qk/1ppbp/1p1p1/5/PBPPP/RN1QK w': [11, 183, 2099, 35803, 461421],
+    'k4/p1r2/5/2N2/1P3/4K w': [12, 116, 838, 8253, 64202],
+    '4k/5/3Q1/5/5/K4 b': [0],
+}
+
+
+def perft(board, depth):
+    """Number of leaf positions depth plies below board's position"""
+    if depth == 0:
+        return 1
+    moves = board.get_all_valid_moves(board.current_turn)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        board.make_move(move[0], move[1])
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def divide(board, depth):
+    """Perft split by root move, as a list of (move, nodes)"""
+    results = []
+    for move in board.get_all_valid_moves(board.current_turn):
+        board.make_move(move[0], move[1])
+        results.append((move, perft(board, depth - 1) if depth > 1 else 1))
+        board.unmake_move()
+    return results
+
+
+def run_perft(fen, depth, show_divide=False):
+    board = ChessBoard.from_fen(fen)
+    print(f"Position: {fen}")
+    for current_depth in range(1, depth + 1):
+        start = time.perf_counter()
+        nodes = perft(board, current_depth)
+        elapsed = time.perf_counter() - start
+        nps = nodes / elapsed if elapsed > 0 else 0
+        print(f"depth {current_depth:2d}  nodes {nodes:10d}  time {elapsed:8.3f}s  nps {nps:10.0f}")
+
+    if show_divide:
+        print(f"\nDivide at depth {depth}:")
+        total = 0
+        for move, nodes in divide(board, depth):
+            print(f"{move_to_text(move)}: {nodes}")
+            total += nodes
+        print(f"Total: {total}")
+
+
+def check_reference(max_depth):
+    """Compare perft against PERFT_REFERENCE; returns True if all match"""
+    all_match = True
+    for fen, counts in PERFT_REFERENCE.items():
+        board = ChessBoard.from_fen(fen)
+        for depth, expected in enumerate(counts[:max_depth], start=1):
+            nodes = perft(board, depth)
+            status = "ok" if nodes == expected else "MISMATCH"
+            if nodes != expected:
+                all_match = False
+            print(f"{status:8s} depth {depth}  {nodes:10d} (expected {expected:10d})  {fen}")
+    return all_match
+
+
+def board_state(board):
+    """What undo/redo and unmake must restore about board's position"""
+    return (board.to_fen(), board.zobrist_key, board.last_moved_piece,
+            board.game_over, board.winner, dict(board.piece_scores))
+
+
+def incremental_mismatches(board):
+    """Names of the incrementally kept fields that differ from a rebuild"""
+    fresh = ChessBoard(board.copy_board())
+    fresh.current_turn = board.current_turn
+    return [name for name in ('bitboards', 'occupancy', 'piece_squares', 'king_squares',
+                              'piece_scores', 'zobrist_key')
+            if getattr(board, name) != getattr(fresh, name)]
+
+
+def self_test(games, seed=0, max_plies=60):
+    """Play games random games, checking make/unmake round trips after every
+    move and go_to_ply jumps at the end of each; returns True if all pass"""
+    rng = random.Random(seed)
+    failures = 0
+
+    def fail(game, what, board):
+        nonlocal failures
+        failures += 1
+        if failures <= 10:
+            print(f"MISMATCH game {game}: {what} at ply {board.ply}  {board.to_fen()}")
+
+    for game in range(games):
+        board = ChessBoard()
+        states = [board_state(board)]
+        while board.ply < max_plies and not board.game_over:
+            # A few search moves must leave the game position untouched
+            stack_size = board.stack_size
+            for _ in range(rng.randint(1, 4)):
+                moves = board.get_all_valid_moves(board.current_turn)
+                if not moves:
+                    break
+                board.make_move(*rng.choice(moves))
+                if incremental_mismatches(board):
+                    fail(game, "make_move " + ", ".join(incremental_mismatches(board)), board)
+            board.unmake_to(stack_size)
+            if board_state(board) != states[-1]:
+                fail(game, "unmake_move", board)
+
+            if board.ply > 2 and rng.random() < 0.1:
+                # Take a few moves back and play on from there
+                board.go_to_ply(rng.randint(0, board.ply - 1))
+                del states[board.ply + 1:]
+            board.move_piece(*rng.choice(board.get_all_valid_moves(board.current_turn)))
+            states.append(board_state(board))
+            if incremental_mismatches(board):
+                fail(game, "move_piece " + ", ".join(incremental_mismatches(board)), board)
+
+        for ply in [rng.randint(0, board.last_ply) for _ in range(10)] + [board.last_ply]:
+            board.go_to_ply(ply)
+            if board_state(board) != states[ply]:
+                fail(game, f"go_to_ply({ply})", board)
+            elif incremental_mismatches(board):
+                fail(game, f"go_to_ply({ply}) " + ", ".join(incremental_mismatches(board)), board)
+
+    print(f"{games} random games: {failures} mismatches")
+    return failures == 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft for the 5x6 MiniChess move generator")
+    parser.add_argument('--depth', type=int, default=4, help="maximum depth to count")
+    parser.add_argument('--fen', default=START_FEN, help="position to start from")
+    parser.add_argument('--divide', action='store_true', help="break the deepest count down by root move")
+    parser.add_argument('--check', action='store_true', help="verify against the reference counts")
+    parser.add_argument('--selftest', action='store_true',
+                        help="check make/unmake and undo/redo round trips over random games")
+    parser.add_argument('--games', type=int, default=200, help="games to play for --selftest")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for --selftest")
+    args = parser.parse_args(argv)
+
+    if args.selftest:
+        return 0 if self_test(args.games, args.seed) else 1
+
+    if args.check:
+        return 0 if check_reference(args.depth) else 1
+    run_perft(args.fen, args.depth, args.divide)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
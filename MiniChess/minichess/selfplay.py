@@ -0,0 +1,225 @@
+"""Headless engine-vs-engine matches played across all cores.
+
+    python -m minichess.selfplay --games 200
+    python -m minichess.selfplay --games 1000 --engine-a "max_depth=4" \
+        --engine-b "max_depth=3 node_limit=2000" --random-plies 4 --workers 8
+
+Each engine is configured with space-separated MiniChessAI attribute
+overrides (max_depth, time_limit, node_limit, ...). Games start after a
+few random plies, and each opening is played twice with colours swapped.
+The 5x6 rules have no move-count or repetition draws, so a game is
+adjudicated drawn on the third repetition of a position or after
+--max-plies plies. Results are reported from engine A's point of view.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+from .engine.board import ChessBoard
+from .engine.ai import MiniChessAI
+
+DEFAULT_ENGINE = {'max_depth': 3, 'time_limit': None}
+# Floor on the variance of game pair scores in the Elo interval: that of
+# pairs a quarter point either side of the mean
+MIN_PAIR_VARIANCE = 0.25 ** 2
+CONSTANTS = {'None': None, 'True': True, 'False': False}
+
+
+def parse_engine_options(text, defaults=DEFAULT_ENGINE):
+    """Turn 'max_depth=4 time_limit=0.1' into an attribute override dict.
+
+    Values are ints, floats, None, True or False; raises ValueError for an
+    item that is not name=value or names no MiniChessAI attribute.
+    """
+    options = dict(defaults)
+    attributes = vars(MiniChessAI())
+    for item in text.split():
+        name, equals, value = item.partition('=')
+        if not equals or not name or not value:
+            raise ValueError(f"expected name=value, got {item!r}")
+        if name not in attributes:
+            raise ValueError(f"MiniChessAI has no attribute {name!r}")
+        if value in CONSTANTS:
+            options[name] = CONSTANTS[value]
+            continue
+        try:
+            options[name] = int(value)
+        except ValueError:
+            try:
+                options[name] = float(value)
+            except ValueError:
+                raise ValueError(f"{name}: {value!r} is not a number, None, True or False") from None
+    return options
+
+
+def make_engine(options):
+    ai = MiniChessAI()
+    for name, value in options.items():
+        setattr(ai, name, value)
+    return ai
+
+
+def random_opening(seed, plies):
+    """Random legal moves from the start position, reproducible from seed"""
+    rng = random.Random(seed)
+    board = ChessBoard()
+    opening = []
+    for _ in range(plies):
+        moves = board.get_all_valid_moves(board.current_turn)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        board.move_piece(move[0], move[1])
+        opening.append(move)
+        if board.game_over:
+            break
+    return opening
+
+
+def play_game(task):
+    """Play one game; returns engine A's result (1, 0.5 or 0) and game details"""
+    pair, opening, a_is_white, options_a, options_b, max_plies = task
+    engines = {
+        'white': make_engine(options_a if a_is_white else options_b),
+        'black': make_engine(options_b if a_is_white else options_a),
+    }
+    board = ChessBoard()
+    for move in opening:
+        board.move_piece(move[0], move[1])
+
+    repetitions = {}
+    reason = 'max plies'
+    start = time.perf_counter()
+    while len(board.move_history) < max_plies:
+        if board.game_over:
+            reason = 'checkmate' if board.winner != 'draw' else 'stalemate'
+            break
+        key = board.zobrist_key
+        repetitions[key] = repetitions.get(key, 0) + 1
+        if repetitions[key] >= 3:
+            reason = 'repetition'
+            break
+        move = engines[board.current_turn].get_best_move(board, board.current_turn)
+        board.move_piece(move[0], move[1])
+    else:
+        if board.game_over:
+            reason = 'checkmate' if board.winner != 'draw' else 'stalemate'
+
+    a_color = 'white' if a_is_white else 'black'
+    if reason == 'checkmate':
+        result = 1.0 if board.winner == a_color else 0.0
+    else:
+        result = 0.5
+    return {
+        'result': result,
+        'pair': pair,
+        'a_color': a_color,
+        'reason': reason,
+        'plies': len(board.move_history),
+        'nodes': {color: engine.nodes_evaluated for color, engine in engines.items()},
+        'time': time.perf_counter() - start,
+    }
+
+
+def elo_difference(score):
+    """Elo difference implied by an expected score in (0, 1)"""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return 400 * math.log10(score / (1 - score))
+
+
+def summarize(games):
+    """Win/draw/loss, score and Elo with a 95% interval for engine A.
+
+    The interval uses the pentanomial variance: that of the game pair
+    scores (one opening with each colour), which take five values and vary
+    less than single games. The variance is no lower than
+    MIN_PAIR_VARIANCE, so the interval stays open when every pair scores
+    the same, e.g. all drawn.
+    """
+    count = len(games)
+    wins = sum(1 for game in games if game['result'] == 1.0)
+    draws = sum(1 for game in games if game['result'] == 0.5)
+    losses = count - wins - draws
+    score = (wins + draws / 2) / count
+    pairs = {}
+    for game in games:
+        pairs.setdefault(game['pair'], []).append(game['result'])
+    pair_scores = [sum(results) / len(results) for results in pairs.values()]
+    pair_mean = sum(pair_scores) / len(pair_scores)
+    variance = sum((pair_score - pair_mean) ** 2 for pair_score in pair_scores) / len(pair_scores)
+    variance = max(variance, MIN_PAIR_VARIANCE)
+    margin = 1.96 * math.sqrt(variance / len(pair_scores))
+    return {
+        'games': count,
+        'wins': wins,
+        'draws': draws,
+        'losses': losses,
+        'score': round(score, 4),
+        'elo': round(elo_difference(score), 1),
+        'elo_low': round(elo_difference(score - margin), 1),
+        'elo_high': round(elo_difference(score + margin), 1),
+        'reasons': {reason: sum(1 for game in games if game['reason'] == reason)
+                    for reason in sorted({game['reason'] for game in games})},
+        'average_plies': round(sum(game['plies'] for game in games) / count, 1),
+    }
+
+
+def run_match(games, options_a, options_b, random_plies=4, max_plies=200, workers=None, seed=0):
+    """Play a match of about games games (rounded up to colour-swapped pairs)"""
+    tasks = []
+    for pair in range((games + 1) // 2):
+        opening = random_opening(seed + pair, random_plies)
+        tasks.append((pair, opening, True, options_a, options_b, max_plies))
+        tasks.append((pair, opening, False, options_a, options_b, max_plies))
+
+    with multiprocessing.Pool(workers) as pool:
+        results = list(pool.imap_unordered(play_game, tasks))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MiniChess engine-vs-engine matches")
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--engine-a', default='', help="attribute overrides for engine A")
+    parser.add_argument('--engine-b', default='', help="attribute overrides for engine B")
+    parser.add_argument('--random-plies', type=int, default=4, help="random opening plies per game pair")
+    parser.add_argument('--max-plies', type=int, default=200, help="adjudicate a draw after this many plies")
+    parser.add_argument('--workers', type=int, default=None, help="processes to use (default: all cores)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='PATH', help="write the summary and games as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        options_a = parse_engine_options(args.engine_a)
+    except ValueError as error:
+        parser.error(f"--engine-a: {error}")
+    try:
+        options_b = parse_engine_options(args.engine_b)
+    except ValueError as error:
+        parser.error(f"--engine-b: {error}")
+    start = time.perf_counter()
+    games = run_match(args.games, options_a, options_b, args.random_plies,
+                      args.max_plies, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+    summary = summarize(games)
+
+    print(f"Engine A: {options_a}")
+    print(f"Engine B: {options_b}")
+    print(f"Games: {summary['games']}  +{summary['wins']} ={summary['draws']} -{summary['losses']}  "
+          f"score {summary['score']:.3f}")
+    print(f"Elo: {summary['elo']:+.1f}  (95% {summary['elo_low']:+.1f} .. {summary['elo_high']:+.1f})")
+    print(f"Endings: {summary['reasons']}  average plies {summary['average_plies']}")
+    print(f"Time: {elapsed:.1f}s")
+
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump({'engine_a': options_a, 'engine_b': options_b,
+                       'summary': summary, 'games': games}, output, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
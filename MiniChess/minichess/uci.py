@@ -0,0 +1,242 @@
+"""Headless text protocol for the MiniChess engine, in the style of UCI.
+
+Reads commands on stdin and answers on stdout; only ChessBoard and
+MiniChessAI are used, so no display or pygame is needed.
+
+    python -m minichess.uci
+
+    uci                                   -> id lines, uciok
+    isready                               -> readyok
+    ucinewgame                            clear the engine's tables
+    setoption name OwnBook value <true|false>
+    setoption name Tablebases value <true|false>
+    position startpos [moves a2a3 ...]
+    position fen <placement> <w|b> [moves ...]
+    go [depth N] [nodes N] [movetime MS] [infinite]
+                                          -> info lines, then bestmove
+                                          (after stop, for infinite)
+    stop                                  end the current search
+    d                                     print the board and its FEN
+    quit
+
+Only stop, ucinewgame and quit cut a search short. position and
+setoption take effect for the next search, and go (or the end of input)
+first lets a running search finish; an infinite one is stopped instead,
+since nothing else would end it.
+"""
+import sys
+import threading
+from .engine.board import ChessBoard, START_FEN, move_to_text, parse_move
+from .engine.ai import MiniChessAI, MATE_SCORE, MATE_THRESHOLD
+from .engine.book import open_default_book
+from .engine.tablebase import open_default_tablebases
+
+ENGINE_NAME = "ChessChamp MiniChess 5x6"
+MAX_DEPTH = 64
+
+
+class UCIEngine:
+    def __init__(self, output=sys.stdout):
+        self.output = output
+        self.board = ChessBoard()
+        self.book = open_default_book()
+        self.tablebases = open_default_tablebases()
+        self.options = {'OwnBook': self.book is not None,
+                        'Tablebases': self.tablebases is not None}
+        self.ai = self.new_engine()
+        self._search_thread = None
+        # Set when bestmove may be sent; an infinite search holds it back
+        # until stop or quit, however early its iterations end.
+        self._search_released = threading.Event()
+        self._output_lock = threading.Lock()
+
+    def send(self, line):
+        with self._output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def handle(self, line):
+        """Process one command line; returns False when the engine should exit"""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+
+        if command == 'uci':
+            self.send(f"id name {ENGINE_NAME}")
+            for name, enabled in self.options.items():
+                self.send(f"option name {name} type check default {'true' if enabled else 'false'}")
+            self.send("uciok")
+        elif command == 'isready':
+            self.send("readyok")
+        elif command == 'ucinewgame':
+            self.stop_search()
+            self.ai = self.new_engine()
+            self.board = ChessBoard()
+        elif command == 'setoption':
+            self.set_option(args)
+        elif command == 'position':
+            # The search works on its own copy of the board
+            self.set_position(args)
+        elif command == 'go':
+            self.finish_search()
+            self.go(args)
+        elif command == 'stop':
+            self.stop_search()
+        elif command == 'd':
+            self.send(self.board.render())
+            self.send(f"Fen: {self.board.to_fen()}")
+        elif command == 'quit':
+            self.stop_search()
+            return False
+        else:
+            self.send(f"info string unknown command: {command}")
+        return True
+
+    def new_engine(self):
+        ai = MiniChessAI()
+        self.apply_options(ai)
+        return ai
+
+    def apply_options(self, ai):
+        ai.book = self.book if self.options['OwnBook'] else None
+        ai.tablebases = self.tablebases if self.options['Tablebases'] else None
+
+    def set_option(self, args):
+        """Record an option; the engine picks it up when its next search starts"""
+        if 'value' in args:
+            split = args.index('value')
+            name_args, value_args = args[:split], args[split + 1:]
+        else:
+            name_args, value_args = args, []
+        if name_args and name_args[0] == 'name':
+            name_args = name_args[1:]
+        name = ' '.join(name_args)
+        options = {option.lower(): option for option in self.options}
+        if name.lower() not in options:
+            self.send(f"info string unknown option: {name}")
+            return
+        value = ' '.join(value_args).lower()
+        if value not in ('true', 'false'):
+            self.send(f"info string invalid value for {options[name.lower()]}: {value or '(none)'}")
+            return
+        self.options[options[name.lower()]] = value == 'true'
+
+    def set_position(self, args):
+        if 'moves' in args:
+            split = args.index('moves')
+            position_args, moves = args[:split], args[split + 1:]
+        else:
+            position_args, moves = args, []
+
+        if position_args and position_args[0] == 'fen':
+            fen = ' '.join(position_args[1:])
+        else:
+            fen = START_FEN
+        try:
+            board = ChessBoard.from_fen(fen)
+        except (ValueError, IndexError) as error:
+            self.send(f"info string invalid position: {error}")
+            return
+
+        for text in moves:
+            try:
+                move = parse_move(text)
+            except (ValueError, IndexError):
+                move = None
+            piece = board.get_piece(*move[0]) if move else None
+            if (move is None or not piece or piece[0] != board.current_turn
+                    or move[1] not in board.get_valid_moves(*move[0])):
+                self.send(f"info string illegal move: {text}")
+                break
+            board.move_piece(move[0], move[1])
+        self.board = board
+
+    def go(self, args):
+        options = {}
+        index = 0
+        while index < len(args):
+            name = args[index]
+            if name == 'infinite':
+                options[name] = True
+                index += 1
+            elif index + 1 < len(args):
+                try:
+                    options[name] = int(args[index + 1])
+                except ValueError:
+                    pass
+                index += 2
+            else:
+                index += 1
+
+        ai = self.ai
+        self.apply_options(ai)
+        ai.max_depth = options.get('depth', MAX_DEPTH)
+        ai.node_limit = options.get('nodes')
+        if 'movetime' in options:
+            ai.time_limit = options['movetime'] / 1000
+        elif 'depth' in options or 'nodes' in options or 'infinite' in options:
+            ai.time_limit = None
+        else:
+            ai.time_limit = 1.0
+        ai.stop_requested = False
+        ai.info_callback = self.send_info
+        self._search_released = threading.Event()
+        if 'infinite' not in options:
+            self._search_released.set()
+
+        board = self.board.copy()
+        self._search_thread = threading.Thread(
+            target=self._search, args=(ai, board, self._search_released), daemon=True)
+        self._search_thread.start()
+
+    def _search(self, ai, board, released):
+        move = ai.get_best_move(board, board.current_turn)
+        released.wait()
+        self.send(f"bestmove {move_to_text(move) if move else '0000'}")
+
+    def send_info(self, info):
+        score = info['score']
+        if abs(score) >= MATE_THRESHOLD:
+            # Mate scores count the plies to mate from the root.
+            plies = MATE_SCORE - abs(score)
+            moves = (plies + 1) // 2
+            score_text = f"mate {moves if score > 0 else -moves}"
+        else:
+            score_text = f"cp {int(round(score))}"
+        elapsed_ms = int(info['time'] * 1000)
+        nps = int(info['nodes'] / info['time']) if info['time'] > 0 else 0
+        self.send(f"info depth {info['depth']} score {score_text} nodes {info['nodes']} "
+                  f"time {elapsed_ms} nps {nps} pv {' '.join(move_to_text(move) for move in info['pv'])}")
+
+    def stop_search(self):
+        if self._search_thread is not None:
+            self._search_released.set()
+            self.ai.stop()
+            self.wait_for_search()
+
+    def finish_search(self):
+        """Let a running search end on its own limits; stop an infinite one"""
+        if self._search_released.is_set():
+            self.wait_for_search()
+        else:
+            self.stop_search()
+
+    def wait_for_search(self):
+        if self._search_thread is not None:
+            self._search_thread.join()
+            self._search_thread = None
+
+
+def main(input_stream=sys.stdin):
+    engine = UCIEngine()
+    for line in input_stream:
+        if not engine.handle(line.strip()):
+            break
+    else:
+        engine.finish_search()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())